@@ -1,3 +1,8 @@
 from . import models
 from . import controllers
-from . import wizard
\ No newline at end of file
+from . import wizard
+
+
+def uninstall_hook(env):
+    """Drop the QR image index that fits.asset init() creates on the core ir_attachment table"""
+    env.cr.execute("DROP INDEX IF EXISTS fits_asset_qr_attachment_uniq")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Fits Assets  Maintenance',
-    'version': '1.1',
+    'version': '1.2',
     'summary': 'Manajemen Aset Tetap (Fixed Assets Management)',
     'description': """
         Modul ini digunakan untuk mengelola aset tetap perusahaan.
@@ -24,6 +24,9 @@
         'security/ir.model.access.csv',
         'security/maintenance_request_cancel_security.xml',
         'data/asset_sequence.xml',
+        'data/asset_label_layout_data.xml',
+        'data/ir_cron_data.xml',
+        'views/asset_label_layout_views.xml',
         'views/asset_qr_report_wizard_views.xml',
         'views/asset_views.xml',
         'views/main_assets_views.xml',
@@ -43,10 +46,13 @@
         'views/maintenance_views.xml',
         'views/maintenance_team_views.xml',
         'views/maintenance_calendar_views.xml',
+        'views/maintenance_analysis_views.xml',
         'wizard/maintenance_request_cancel_views.xml',
+        'wizard/asset_import_views.xml',
         'views/menus.xml',
     ],
     'demo': [],
+    'uninstall_hook': 'uninstall_hook',
     'application': True,
     'auto_install': False,
     'license': 'LGPL-3',
@@ -1,2 +1,4 @@
 # -*- coding: utf-8 -*-
 # Controllers init file
+from . import asset_scan
+from . import asset_labels
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import logging
+import tempfile
+
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import content_disposition, request
+
+_logger = logging.getLogger(__name__)
+
+LABEL_PDF_NAME = 'Asset QR Labels.pdf'
+
+
+class AssetLabelController(http.Controller):
+
+    @http.route('/fits_assets_maintenance/qr_labels/<int:wizard_id>', type='http', auth='user')
+    def download_qr_labels(self, wizard_id, **kwargs):
+        """Render the vector label sheet of a print wizard into a temporary file and stream it
+
+        The PDF is never held in memory or stored: the file is read back in chunks
+        by the WSGI server and removed once the response is closed.
+        """
+        wizard = request.env['fits.asset.qr.report.wizard'].browse(wizard_id).exists()
+        if not wizard or not wizard.label_layout_id:
+            return request.not_found()
+        assets = wizard._get_assets_to_print()
+
+        output = tempfile.TemporaryFile()
+        try:
+            wizard.label_layout_id._render_labels_pdf(assets, output)
+            size = output.tell()
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
+
+        response = request.make_response(
+            wrap_file(request.httprequest.environ, output),
+            headers=[
+                ('Content-Type', 'application/pdf'),
+                ('Content-Length', size),
+                ('Content-Disposition', content_disposition(LABEL_PDF_NAME)),
+            ],
+        )
+        response.direct_passthrough = True
+        return response
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import request
+
+_logger = logging.getLogger(__name__)
+
+# Requests still waiting for work on the asset
+OPEN_REQUEST_STATES = ('draft', 'in_progress', 'repaired')
+
+QR_CODE_PREFIX = 'ASSET CODE:'
+
+
+def parse_scan_payload(payload):
+    """Return the serial code of a scanned QR payload (see fits.asset._get_qr_payload) or barcode"""
+    payload = (payload or '').strip()
+    for line in payload.splitlines():
+        if line.strip().upper().startswith(QR_CODE_PREFIX):
+            return line.split(':', 1)[1].strip()
+    # Plain barcode: the serial code itself
+    return payload.splitlines()[0].strip() if payload else ''
+
+
+class AssetScanController(http.Controller):
+
+    @http.route('/fits_assets_maintenance/scan', type='json', auth='user')
+    def scan_asset(self, code=None, **kwargs):
+        """Look up an asset from a scanned QR payload or serial code
+
+        Returns the asset summary, its open maintenance requests and its next due
+        date, or ``{'error': ...}`` when the code is empty, unknown or not readable.
+        """
+        start = time.perf_counter()
+        serial_code = parse_scan_payload(code)
+        if not serial_code:
+            return {'error': 'empty_code'}
+
+        try:
+            summary = request.env['fits.asset']._get_scan_summary(serial_code)
+        except AccessError:
+            return {'error': 'access_denied', 'code': serial_code}
+        if not summary:
+            return {'error': 'not_found', 'code': serial_code}
+
+        open_requests = request.env['fits.maintenance.request'].search_read(
+            [('asset_id', '=', summary['id']), ('state', 'in', OPEN_REQUEST_STATES)],
+            ['maintenance_request_type', 'maintenance_type', 'state', 'scheduled_date', 'team_id', 'user_id'],
+            order='scheduled_date asc, id asc',
+        )
+        _logger.debug("Asset scan %s answered in %.1fms", serial_code, (time.perf_counter() - start) * 1000)
+        return {
+            'asset': summary,
+            'open_requests': open_requests,
+            'next_maintenance_date': summary['next_maintenance_date'],
+        }
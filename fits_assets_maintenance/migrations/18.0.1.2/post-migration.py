@@ -0,0 +1,21 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Drop legacy stored QR images and switch the maintenance request sequence to the
+    standard implementation (unique counters are backfilled by fits.asset init())"""
+    if not version:
+        return
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+
+    # qr_code_image is no longer stored per asset; images are now cached by payload hash
+    env['ir.attachment'].search([
+        ('res_model', '=', 'fits.asset'),
+        ('res_field', '=', 'qr_code_image'),
+    ]).unlink()
+
+    # Request numbers are reserved in blocks from a PostgreSQL sequence (data is noupdate)
+    sequence = env.ref('fits_assets_maintenance.seq_fits_maintenance_request', raise_if_not_found=False)
+    if sequence and sequence.implementation != 'standard':
+        sequence.implementation = 'standard'
@@ -0,0 +1,61 @@
+def migrate(cr, version):
+    """Collapse duplicate calendar events and auto-generated requests before their unique indexes are added
+    and prefill the new responsible_user_id columns
+
+    Stored calendar events without state are kept: the calendar only computes the
+    occurrences that have no stored event, and sync_asset_events drops the ones that
+    stop being occurrences."""
+    if not version:
+        return
+
+    # Keep the oldest event of every asset and date
+    cr.execute("""
+        DELETE FROM fits_maintenance_calendar c
+         USING (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY asset_id, maintenance_date ORDER BY id) AS rn
+              FROM fits_maintenance_calendar
+         ) d
+         WHERE c.id = d.id
+           AND d.rn > 1
+    """)
+
+    # Auto-generated requests: drop duplicate drafts, keeping the most advanced request of every
+    # asset and date; remaining duplicates (already worked on) are no longer considered generated
+    cr.execute("""
+        WITH ranked AS (
+            SELECT id, state,
+                   ROW_NUMBER() OVER (PARTITION BY asset_id, scheduled_date
+                                      ORDER BY (state = 'draft'), id) AS rn
+              FROM fits_maintenance_request
+             WHERE auto_generated
+        ), deleted AS (
+            DELETE FROM fits_maintenance_request r
+             USING ranked d
+             WHERE r.id = d.id
+               AND d.rn > 1
+               AND d.state = 'draft'
+        )
+        UPDATE fits_maintenance_request r
+           SET auto_generated = FALSE
+          FROM ranked d
+         WHERE r.id = d.id
+           AND d.rn > 1
+           AND d.state != 'draft'
+    """)
+
+    # Prefill responsible_user_id in SQL so the ORM does not recompute it record by record
+    cr.execute("""
+        ALTER TABLE fits_asset ADD COLUMN IF NOT EXISTS responsible_user_id int4;
+        UPDATE fits_asset a
+           SET responsible_user_id = e.user_id
+          FROM hr_employee e
+         WHERE e.id = a.responsible_person_id;
+    """)
+    for table in ('fits_maintenance_request', 'fits_maintenance_calendar'):
+        cr.execute(f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS responsible_user_id int4;
+            UPDATE {table} t
+               SET responsible_user_id = a.responsible_user_id
+              FROM fits_asset a
+             WHERE a.id = t.asset_id;
+        """)
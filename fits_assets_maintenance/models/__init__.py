@@ -5,9 +5,11 @@ from . import location_assets
 from . import asset_transfer
 from . import asset_disposal
 from . import asset_qr_report_wizard
+from . import asset_label_layout
 from . import maintenance
 from . import maintenance_team
 from . import maintenance_calendar
+from . import maintenance_analysis
 from . import maintenance_report_wizard
 from . import asset_report_wizard
 from . import asset_transfer_report_wizard
@@ -1,15 +1,65 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
-from odoo.exceptions import UserError
+from odoo.exceptions import MissingError, UserError
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.lru import LRU
 import base64
+import hashlib
 import io
-import re
+import logging
+import time
+import psycopg2
+from collections import defaultdict
 from datetime import timedelta
 try:
     import qrcode
 except ImportError:
     qrcode = None
 
+from .recurrence import iter_occurrences
+
+
+def render_qr_png(payload):
+    """Render payload as a QR code and return the raw PNG bytes"""
+    qr = qrcode.QRCode(
+        version=1,  # Keep small version, will increase if needed
+        error_correction=qrcode.constants.ERROR_CORRECT_M,  # Medium error correction
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    # Create image and convert to bytes
+    img = qr.make_image(fill_color="black", back_color="white")
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG')
+    return img_buffer.getvalue()
+
+
+def render_qr_pngs(payloads):
+    """Render a chunk of payloads and return their PNG bytes in the same order"""
+    return [render_qr_png(payload) for payload in payloads]
+
+
+_logger = logging.getLogger(__name__)
+
+# Scan lookups, per worker process: (dbname, serial code) -> (expiry, asset summary).
+# Asset writes evict their own entries; the TTL bounds staleness of entries held by
+# other workers and of related names (location, responsible) renamed elsewhere.
+SCAN_CACHE_SIZE = 4096
+SCAN_CACHE_TTL = 300
+_scan_cache = LRU(SCAN_CACHE_SIZE)
+
+
+def _evict_scan_entry(key):
+    """Drop a scan cache entry if present (odoo.tools.lru.LRU.pop takes no default)"""
+    try:
+        del _scan_cache[key]
+    except KeyError:
+        pass
+
 
 class Asset(models.Model):
     _name = 'fits.asset'
@@ -27,20 +77,20 @@ class Asset(models.Model):
     )
 
     # Asset name as Char field (user input) - Identitas Aset manual input oleh user
-    asset_name = fields.Char(string='Asset Name', required=True, help='Nama asset - field manual input untuk identitas aset')
+    asset_name = fields.Char(string='Asset Name', required=True, index='trigram', help='Nama asset - field manual input untuk identitas aset')
 
     # Many2one field for selecting main asset - will auto-populate other fields
     main_asset_selection = fields.Many2one('fits.main.assets', string='Main Asset',
                                          help='Pilih main asset - akan mengisi otomatis kategori dan identitas aset')
 
-    category_id = fields.Many2one('fits.asset.category', string='Asset Category', required=True,
+    category_id = fields.Many2one('fits.asset.category', string='Asset Category', required=True, index=True,
                                 help='Kategori asset - akan diisi otomatis dari Main Asset')
 
     # Computed domain field for category_id filtering
     category_domain = fields.Char(compute='_compute_category_domain', store=False)
 
     # Serial Number Code - user can generate this
-    serial_number_code = fields.Char(string='Serial Number Code', 
+    serial_number_code = fields.Char(string='Serial Number Code', index='trigram',
                                    help='Kode Asset yang digenerate dari Main Asset, Asset Category, dan Location Asset dengan format: [MainAssetCode][CategoryCode][LocationCode][Counter] (4 digit: 0001, 0002, 0003, ...)')
     # Location Assets - user can select manually or it will be auto-filled based on asset_name
     location_asset_selection = fields.Many2one('fits.location.assets', string='Location Assets', required=True,
@@ -69,41 +119,98 @@ class Asset(models.Model):
         return [('id', '=', -1)]  # Default: tidak menampilkan tim apapun
 
     # Unique counter for this asset record - assigned once and reused
-    unique_counter = fields.Integer(string='Unique Counter', copy=False, readonly=True,
+    unique_counter = fields.Integer(string='Unique Counter', copy=False, readonly=True, index=True,
                                    help='Unique counter assigned to this asset record')
 
+    # PostgreSQL sequence that hands out unique_counter values (see _reserve_unique_counters)
+    _unique_counter_sequence = 'fits_asset_unique_counter_seq'
+
+    def init(self):
+        """Create the unique counter sequence and seed it from existing assets
+
+        Runs on install and on the upgrade that introduces the sequence, so this is
+        the only place the counters are backfilled.
+        """
+        super().init()
+        self.env.cr.execute("""
+            SELECT 1 FROM pg_class WHERE relkind = 'S' AND relname = %s
+        """, [self._unique_counter_sequence])
+        if not self.env.cr.fetchone():
+            self.env.cr.execute(f"CREATE SEQUENCE {self._unique_counter_sequence} INCREMENT BY 1 START WITH 1")
+            self._backfill_unique_counters()
+        # One cached QR image per payload hash, also across concurrent renderers (see _store_qr_images)
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS fits_asset_qr_attachment_uniq
+                ON ir_attachment (res_model, res_field, name)
+             WHERE res_model = 'fits.asset' AND res_field = 'qr_code_hash'
+        """)
+
+    @api.model
+    def _reserve_unique_counters(self, count=1):
+        """Reserve a contiguous block of ``count`` unique counters in O(1)
+
+        The block is taken from a PostgreSQL sequence, so concurrent workers never
+        receive the same value and no scan over fits_asset is needed. A
+        transaction-level advisory lock keeps the nextval/setval pair atomic so that
+        the returned block is contiguous; PostgreSQL releases it at commit or rollback,
+        so an aborted transaction cannot leave it held on a pooled connection.
+        """
+        if count <= 0:
+            return []
+        cr = self.env.cr
+        cr.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [self._unique_counter_sequence])
+        cr.execute("SELECT nextval(%s)", [self._unique_counter_sequence])
+        first_counter = cr.fetchone()[0]
+        if count > 1:
+            cr.execute("SELECT setval(%s, %s)", [self._unique_counter_sequence, first_counter + count - 1])
+        return list(range(first_counter, first_counter + count))
+
     def _get_next_unique_counter(self):
         """Get the next available unique counter for new assets - unlimited growth"""
-        # Find the highest existing counter across all assets using unique_counter field first,
-        # then fall back to extracting from serial_number_code for backward compatibility
-        max_counter = 0
-
-        # First, try to get the highest unique_counter value
-        highest_counter_asset = self.env['fits.asset'].search([
-            ('unique_counter', '>', 0)
-        ], order='unique_counter DESC', limit=1)
-
-        if highest_counter_asset and highest_counter_asset.unique_counter:
-            max_counter = highest_counter_asset.unique_counter
-        else:
-            # Fallback: extract from serial_number_code for existing records
-            existing_assets = self.env['fits.asset'].search([
-                ('serial_number_code', '!=', False)
-            ], order='serial_number_code DESC', limit=1)
-
-            if existing_assets and existing_assets.serial_number_code:
-                # Extract counter from the highest existing code
-                highest_code = existing_assets.serial_number_code
-                # Find the last 4 digits (counter part)
-                counter_match = re.search(r'\d{4}$', highest_code)
-                if counter_match:
-                    try:
-                        max_counter = int(counter_match.group())
-                    except:
-                        max_counter = 0
-
-        # Return next counter (unlimited growth)
-        return max_counter + 1
+        return self._reserve_unique_counters(1)[0]
+
+    @api.model
+    def _backfill_unique_counters(self):
+        """One-time backfill of unique_counter and seeding of the counter sequence
+
+        Counters are recovered from the last 4 digits of serial_number_code for legacy
+        records, the sequence is moved past the highest counter in use, duplicates are
+        renumbered and any asset still without a counter receives a fresh one.
+        """
+        cr = self.env.cr
+        self.flush_model(['unique_counter', 'serial_number_code'])
+
+        # Recover counters from existing serial number codes
+        cr.execute("""
+            UPDATE fits_asset
+               SET unique_counter = substring(serial_number_code from '(\\d{4})$')::integer
+             WHERE COALESCE(unique_counter, 0) <= 0
+               AND serial_number_code ~ '\\d{4}$'
+        """)
+
+        # Seed the sequence past the highest counter in use
+        cr.execute("SELECT COALESCE(MAX(unique_counter), 0) FROM fits_asset")
+        max_counter = cr.fetchone()[0]
+        cr.execute("SELECT setval(%s, %s, %s)", [self._unique_counter_sequence, max(max_counter, 1), max_counter > 0])
+
+        # Renumber duplicates (keep the oldest record) and assets without counter
+        cr.execute("""
+            WITH ranked AS (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY unique_counter ORDER BY id) AS rank
+                  FROM fits_asset
+                 WHERE unique_counter > 0
+            )
+            UPDATE fits_asset a
+               SET unique_counter = nextval(%s)
+              FROM ranked
+             WHERE ranked.id = a.id AND ranked.rank > 1
+        """, [self._unique_counter_sequence])
+        cr.execute("""
+            UPDATE fits_asset
+               SET unique_counter = nextval(%s)
+             WHERE COALESCE(unique_counter, 0) <= 0
+        """, [self._unique_counter_sequence])
+        self.invalidate_model(['unique_counter'])
 
     @api.depends()
     def _compute_can_edit_maintenance(self):
@@ -116,32 +223,22 @@ class Asset(models.Model):
     @api.depends('main_asset_selection')
     def _compute_category_domain(self):
         """Compute domain for category_id field based on main_asset_selection"""
+        category_ids = self.env['fits.asset.category']._get_category_ids_by_main_asset()
         for record in self:
-            if record.main_asset_selection:
-                # Filter categories for the selected Main Asset
-                main_asset_id = record.main_asset_selection.id
-                domain = [('main_asset_id', '=', main_asset_id)]
-
-                # Check if categories exist
-                category_count = record.env['fits.asset.category'].search_count(domain)
-
-                if category_count > 0:
-                    # Categories exist - use the filtering domain
-                    record.category_domain = str(domain)
-                    print(f"DEBUG: Setting category domain for Main Asset {record.main_asset_selection.display_name}: {domain}")
-                else:
-                    # No categories found - show empty
-                    record.category_domain = str([('id', '=', False)])
-                    print(f"DEBUG: No categories found for Main Asset {record.main_asset_selection.display_name}")
+            if record.main_asset_selection and category_ids.get(record.main_asset_selection.id):
+                # Categories exist - filter categories for the selected Main Asset
+                record.category_domain = str([('main_asset_id', '=', record.main_asset_selection.id)])
             else:
-                # No Main Asset selected - show empty
+                # No Main Asset selected or no categories found - show empty
                 record.category_domain = str([('id', '=', False)])
-                print("DEBUG: No Main Asset selected - category domain set to empty")
-    qr_code_image = fields.Binary(string='QR Code', compute='_compute_qr_code', store=True,
+
+    qr_code_hash = fields.Char(string='QR Code Hash', compute='_compute_qr_code_hash', store=True, copy=False,
+                               help='SHA-1 dari isi QR Code, dipakai sebagai kunci cache gambar QR')
+    qr_code_image = fields.Binary(string='QR Code', compute='_compute_qr_code',
                                  help='QR Code dari serial number dan location asset')
     
     # Informasi Perolehan
-    acquisition_date = fields.Date(string='Acquisition Date')
+    acquisition_date = fields.Date(string='Acquisition Date', index=True)
     purchase_reference = fields.Many2one('purchase.order', string='Purchase Reference (PO/Invoice)',
                                        domain=[('state', 'in', ['purchase', 'done'])])
     supplier_id = fields.Many2one('res.partner', string='Supplier / Vendor', 
@@ -158,6 +255,9 @@ class Asset(models.Model):
     company_id = fields.Many2one('res.company', string='Company', default=lambda self: self.env.company)
     department_id = fields.Many2one('hr.department', string='Department / Cost Center')
     responsible_person_id = fields.Many2one('hr.employee', string='Responsible Person')
+    # Denormalised user of the responsible employee, used by record rules and asset domains
+    responsible_user_id = fields.Many2one('res.users', string='Responsible User',
+                                          related='responsible_person_id.user_id', store=True, index=True)
     
 
     
@@ -166,7 +266,7 @@ class Asset(models.Model):
         ('draft', 'Draft'),
         ('active', 'Active'),
         ('maintenance', 'In Maintenance')
-    ], string='Status Asset', default='draft')
+    ], string='Status Asset', default='draft', index=True)
     condition = fields.Selection([
         ('new', 'Baru'),
         ('good', 'Baik'),
@@ -187,11 +287,15 @@ class Asset(models.Model):
     recurrence_start_date = fields.Date(string='Recurrence Start Date')
 
     recurrence_interval = fields.Integer(string='Recurrence Interval', default=1,
-                                       help='Interval for recurrence (e.g., every 2 weeks)')
+                                       help='Number of occurrences, one pattern step apart (e.g., 4 with a weekly pattern: 4 weekly maintenances)')
 
     recurrence_end_date = fields.Date(string='Recurrence End Date')
 
-    next_maintenance_date = fields.Date(string='Next Maintenance Date', compute='_compute_next_maintenance')
+    next_maintenance_date = fields.Date(string='Next Maintenance Date', compute='_compute_next_maintenance',
+                                        store=True, index=True)
+
+    schedule_materialized_until = fields.Date(string='Schedule Generated Until', readonly=True, copy=False,
+                                              help='Last date for which calendar events and maintenance requests have been generated')
     
     # Dokumentasi
     image_1920 = fields.Binary(string='Foto Aset', attachment=True)
@@ -211,76 +315,79 @@ class Asset(models.Model):
             else:
                 record.name = 'Unnamed Asset'
 
+    @api.model
+    def _name_search(self, name, domain=None, operator='ilike', limit=None, order=None):
+        """Search assets by fragments of serial number code or asset name, best matches first
+
+        Both columns carry trigram indexes, so partial matches (e.g. the last 4 digits
+        of the serial code) do not scan the table. Ranking: exact serial code, serial
+        code suffix or prefix, asset name prefix, then any other match.
+        """
+        if not name or operator != 'ilike':
+            return super(Asset, self)._name_search(name, domain, operator, limit, order)
+
+        search_domain = expression.AND([
+            domain or [],
+            ['|', ('serial_number_code', 'ilike', name), ('asset_name', 'ilike', name)],
+        ])
+        query = self._search(search_domain, limit=limit)
+        code = self._field_to_sql(self._table, 'serial_number_code', query)
+        asset_name = self._field_to_sql(self._table, 'asset_name', query)
+        query.order = SQL(
+            """CASE WHEN %(code)s ILIKE %(name)s THEN 0
+                   WHEN %(code)s ILIKE %(suffix)s OR %(code)s ILIKE %(prefix)s THEN 1
+                   WHEN %(asset_name)s ILIKE %(prefix)s THEN 2
+                   ELSE 3 END, %(asset_name)s, %(id)s""",
+            code=code, asset_name=asset_name, name=name,
+            prefix=f'{name}%', suffix=f'%{name}',
+            id=SQL.identifier(self._table, 'id'),
+        )
+        return query
+
     @api.depends('recurrence_start_date', 'recurrence_pattern', 'recurrence_interval', 'recurrence_end_date', 'status')
     def _compute_next_maintenance(self):
-        """Compute next maintenance date based on recurrence settings"""
+        """Compute next maintenance date: first scheduled occurrence after the start date that is not in the past
+
+        Uses the same occurrences as the generated schedule (see _iter_maintenance_occurrences),
+        so it is always the date of one of the generated maintenance requests.
+        """
+        today = fields.Date.context_today(self)
         for record in self:
             # Only compute next maintenance date if status is 'maintenance' and has basic settings
             if record.status == 'maintenance' and record.recurrence_pattern != 'none' and record.recurrence_start_date:
-
-                base_date = record.recurrence_start_date
-
-                # Mode 1: Calculate using End Date + Pattern (when end date is set, ignore interval)
-                if record.recurrence_end_date and not record.recurrence_interval:
-                    # Calculate next maintenance date based on pattern from start date towards end date
-                    if record.recurrence_pattern == 'daily':
-                        # For daily: next day from start date, but not beyond end date
-                        next_date = base_date + timedelta(days=1)
-                        record.next_maintenance_date = min(next_date, record.recurrence_end_date)
-                    elif record.recurrence_pattern == 'weekly':
-                        # For weekly: next week from start date, but not beyond end date
-                        next_date = base_date + timedelta(weeks=1)
-                        record.next_maintenance_date = min(next_date, record.recurrence_end_date)
-                    elif record.recurrence_pattern == 'monthly':
-                        # For monthly: next month from start date, but not beyond end date
-                        next_date = base_date
-                        try:
-                            next_date = next_date.replace(month=next_date.month + 1)
-                            record.next_maintenance_date = min(next_date, record.recurrence_end_date)
-                        except ValueError:
-                            # Handle month overflow (e.g., Dec + 1 month = Jan next year)
-                            record.next_maintenance_date = record.recurrence_end_date
-                    elif record.recurrence_pattern == 'yearly':
-                        # For yearly: next year from start date, but not beyond end date
-                        next_date = base_date
-                        try:
-                            next_date = next_date.replace(year=next_date.year + 1)
-                            record.next_maintenance_date = min(next_date, record.recurrence_end_date)
-                        except ValueError:
-                            # Handle year overflow
-                            record.next_maintenance_date = record.recurrence_end_date
-                    else:
-                        record.next_maintenance_date = base_date
-
-                # Mode 2: Calculate using Interval (when interval is set, ignore end date)
-                elif record.recurrence_interval and not record.recurrence_end_date:
-                    # Calculate using interval regardless of pattern
-                    if record.recurrence_pattern == 'daily':
-                        record.next_maintenance_date = base_date + timedelta(days=record.recurrence_interval)
-                    elif record.recurrence_pattern == 'weekly':
-                        record.next_maintenance_date = base_date + timedelta(weeks=record.recurrence_interval)
-                    elif record.recurrence_pattern == 'monthly':
-                        next_date = base_date
-                        try:
-                            record.next_maintenance_date = next_date.replace(month=next_date.month + record.recurrence_interval)
-                        except ValueError:
-                            # Handle month overflow
-                            record.next_maintenance_date = next_date.replace(year=next_date.year + 1, month=1)
-                    elif record.recurrence_pattern == 'yearly':
-                        next_date = base_date
-                        try:
-                            record.next_maintenance_date = next_date.replace(year=next_date.year + record.recurrence_interval)
-                        except ValueError:
-                            # Handle year overflow
-                            record.next_maintenance_date = next_date.replace(year=next_date.year + record.recurrence_interval)
-                    else:
-                        record.next_maintenance_date = base_date + timedelta(days=record.recurrence_interval)
-                else:
-                    # If both are set or neither is set, use start date as fallback
-                    record.next_maintenance_date = base_date
+                after_start = max(today, record.recurrence_start_date + timedelta(days=1))
+                record.next_maintenance_date = next(record._iter_maintenance_occurrences(after_start), False)
             else:
                 record.next_maintenance_date = False
 
+    def _iter_maintenance_occurrences(self, date_from=None, date_to=None):
+        """Lazily yield the scheduled maintenance dates of this asset within [date_from, date_to]
+
+        Recurrence Interval is the number of occurrences (one pattern step apart) and
+        Recurrence End Date the last possible date (interval takes precedence when both
+        are set). Every caller (next date, schedule, calendar) goes through this method.
+        """
+        self.ensure_one()
+        if self.recurrence_interval and self.recurrence_interval > 0:
+            return iter_occurrences(self.recurrence_start_date, self.recurrence_pattern,
+                                    count=self.recurrence_interval, date_from=date_from, date_to=date_to)
+        if self.recurrence_end_date:
+            return iter_occurrences(self.recurrence_start_date, self.recurrence_pattern,
+                                    until=self.recurrence_end_date, date_from=date_from, date_to=date_to)
+        return iter([])
+
+    @api.model
+    def _cron_update_next_maintenance_date(self, batch_size=1000):
+        """Nightly cron: advance next_maintenance_date of assets whose due date has passed"""
+        assets = self.search([('next_maintenance_date', '<', fields.Date.context_today(self))])
+        for offset in range(0, len(assets), batch_size):
+            batch = self.browse(assets.ids[offset:offset + batch_size])
+            self.env.add_to_compute(self._fields['next_maintenance_date'], batch)
+            batch.flush_recordset(['next_maintenance_date'])
+            # The recompute bypasses write(): evict the scan summaries holding the old due date
+            self._invalidate_scan_cache(set(batch.mapped('serial_number_code')))
+            batch.invalidate_recordset()
+
     @api.depends('main_asset_selection')
     def _compute_category_id(self):
         """Removed auto-fill functionality for Asset Category"""
@@ -302,6 +409,11 @@ class Asset(models.Model):
             else:
                 record.location_asset_selection = False
 
+    @api.model
+    def _compose_serial_number_code(self, code_parts, counter):
+        """Build serial number code: [MainAssetCode][CategoryCode][LocationCode][Counter]"""
+        return ''.join(code_parts) + f"{counter:04d}"
+
     def generate_code(self):
         """Generate unique asset code for assets"""
         for record in self:
@@ -320,8 +432,6 @@ class Asset(models.Model):
                 code_parts.append(record.location_asset_selection.location_code)
 
             if code_parts:
-                combined_code = ''.join(code_parts)
-
                 # Get or assign unique counter for this record
                 if not record.unique_counter:
                     # First time generating code for this record - assign a new unique counter
@@ -331,73 +441,313 @@ class Asset(models.Model):
                 if record.unique_counter <= 0:
                     record.unique_counter = self._get_next_unique_counter()
 
-                # Use the assigned unique counter (formatted as 4 digits with leading zeros)
-                unique_code_formatted = f"{record.unique_counter:04d}"
-
-                # Set the complete asset code
-                record.serial_number_code = combined_code + unique_code_formatted
+                # Set the complete asset code (counter formatted as 4 digits with leading zeros)
+                record.serial_number_code = self._compose_serial_number_code(code_parts, record.unique_counter)
             else:
                 # Show error message when no components available
                 raise UserError('Cannot generate asset code. Please select Main Asset, Category, and/or Location.')
-    
-    @api.depends('serial_number_code', 'location_asset_selection', 'asset_name', 'responsible_person_id')
+
+    @api.model
+    def _regenerate_serial_codes(self, field_name, ids):
+        """Recompute serial_number_code in one UPDATE for assets referencing the given records
+
+        field_name is the fits.asset Many2one whose target codes changed (main asset,
+        category or location). Only assets that already have a code are updated, and
+        only rows whose code actually changes are touched; those rows then get their
+        dependent fields (QR hash, related asset codes) marked for recomputation.
+
+        The UPDATE bypasses Asset.write: write() overrides and anything hooked on
+        them do not run for these rows (serial_number_code is not tracked, so no
+        chatter message is lost). The scan cache is evicted here for the old and new
+        codes; callers that need other side effects use the returned rows.
+
+        :return: list of (asset_id, old_code, new_code) for the assets whose code changed
+        """
+        assert field_name in ('main_asset_selection', 'category_id', 'location_asset_selection')
+        if not ids:
+            return []
+
+        self.env['fits.main.assets'].flush_model(['asset_code'])
+        self.env['fits.asset.category'].flush_model(['category_code'])
+        self.env['fits.location.assets'].flush_model(['location_code'])
+        self.flush_model(['main_asset_selection', 'category_id', 'location_asset_selection',
+                          'unique_counter', 'serial_number_code'])
+
+        self.env.cr.execute(f"""
+            WITH new_codes AS (
+                SELECT a.id,
+                       a.serial_number_code AS old_code,
+                       CONCAT(ma.asset_code, c.category_code, l.location_code,
+                              LPAD(a.unique_counter::text, GREATEST(4, LENGTH(a.unique_counter::text)), '0')) AS code
+                  FROM fits_asset a
+             LEFT JOIN fits_main_assets ma ON ma.id = a.main_asset_selection
+             LEFT JOIN fits_asset_category c ON c.id = a.category_id
+             LEFT JOIN fits_location_assets l ON l.id = a.location_asset_selection
+                 WHERE a.{field_name} IN %s
+                   AND a.serial_number_code IS NOT NULL
+                   AND a.unique_counter > 0
+                   AND COALESCE(NULLIF(ma.asset_code, ''), NULLIF(c.category_code, ''), NULLIF(l.location_code, '')) IS NOT NULL
+            )
+            UPDATE fits_asset a
+               SET serial_number_code = new_codes.code
+              FROM new_codes
+             WHERE new_codes.id = a.id
+               AND a.serial_number_code IS DISTINCT FROM new_codes.code
+         RETURNING a.id, new_codes.old_code, a.serial_number_code
+        """, [tuple(ids)])
+        rows = self.env.cr.fetchall()
+        self._invalidate_scan_cache({code for _asset_id, old_code, new_code in rows for code in (old_code, new_code)})
+        assets = self.browse([row[0] for row in rows])
+        if assets:
+            assets.invalidate_recordset(['serial_number_code'])
+            assets.modified(['serial_number_code'])
+        return rows
+
+    @api.model
+    def _prepare_serial_number_codes(self, vals_list):
+        """Fill serial_number_code in vals_list before INSERT, reading component codes once per batch"""
+        code_fields = [
+            ('main_asset_selection', 'fits.main.assets', 'asset_code'),
+            ('category_id', 'fits.asset.category', 'category_code'),
+            ('location_asset_selection', 'fits.location.assets', 'location_code'),
+        ]
+        pending = [vals for vals in vals_list if not vals.get('serial_number_code') and vals.get('unique_counter')]
+        if not pending:
+            return
+
+        # Map record id -> code for every referenced Main Asset / Category / Location
+        code_maps = {}
+        for field_name, model_name, code_field in code_fields:
+            ids = {vals[field_name] for vals in pending if vals.get(field_name)}
+            records = self.env[model_name].browse(ids)
+            code_maps[field_name] = {record.id: record[code_field] for record in records}
+
+        for vals in pending:
+            code_parts = [
+                code_maps[field_name].get(vals[field_name])
+                for field_name, _model_name, _code_field in code_fields
+                if vals.get(field_name)
+            ]
+            code_parts = [code for code in code_parts if code]
+            if code_parts:
+                vals['serial_number_code'] = self._compose_serial_number_code(code_parts, vals['unique_counter'])
+
+    def _get_qr_payload(self):
+        """Return the text encoded in the QR code of this asset"""
+        self.ensure_one()
+        asset_code = self.serial_number_code
+        asset_name = self.asset_name or 'N/A'
+
+        # Get location information
+        location_info = 'N/A'
+        if self.location_asset_selection and self.location_asset_selection.location_name:
+            location_info = self.location_asset_selection.location_name
+
+        # Get responsible person information
+        responsible_info = 'N/A'
+        if self.responsible_person_id and self.responsible_person_id.name:
+            responsible_info = self.responsible_person_id.name
+
+        # Create QR text with organized layout
+        qr_text = f'ASSET CODE: {asset_code}\n'
+        qr_text += f'NAME ASSET: {asset_name}\n'
+        qr_text += f'LOCATION: {location_info}\n'
+        qr_text += f'RESPONSIBLE: {responsible_info}'
+        return qr_text
+
+    def _prepare_scan_summary(self):
+        """Return the JSON-serialisable summary of this asset returned by scan lookups"""
+        self.ensure_one()
+        return {
+            'id': self.id,
+            'name': self.name,
+            'asset_name': self.asset_name,
+            'serial_number_code': self.serial_number_code,
+            'status': self.status,
+            'condition': self.condition,
+            'category': self.category_id.display_name or False,
+            'location': self.location_asset_selection.display_name or False,
+            'responsible': self.responsible_person_id.name or False,
+            'next_maintenance_date': fields.Date.to_string(self.next_maintenance_date),
+        }
+
+    @api.model
+    def _get_scan_summary(self, serial_code):
+        """Return the scan summary of the asset with this serial code, or None
+
+        Summaries are kept in the in-process LRU cache; a cache hit costs a single
+        access check, so users only get assets they are allowed to read. Entries of
+        assets deleted by another worker are dropped and looked up again.
+        """
+        key = (self.env.cr.dbname, serial_code)
+        entry = _scan_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            try:
+                self.browse(entry[1]['id']).check_access('read')
+                return entry[1]
+            except MissingError:
+                _evict_scan_entry(key)
+
+        asset = self.search([('serial_number_code', '=', serial_code)], limit=1)
+        if not asset:
+            return None
+        summary = asset._prepare_scan_summary()
+        _scan_cache[key] = (time.monotonic() + SCAN_CACHE_TTL, summary)
+        return summary
+
+    @api.model
+    def _invalidate_scan_cache(self, serial_codes):
+        """Evict the scan summaries of these serial codes from the cache of this worker"""
+        dbname = self.env.cr.dbname
+        for serial_code in serial_codes:
+            if serial_code:
+                _evict_scan_entry((dbname, serial_code))
+
+    @api.depends('serial_number_code', 'asset_name', 'location_asset_selection.location_name', 'responsible_person_id.name')
+    def _compute_qr_code_hash(self):
+        """Hash the QR payload - writes only change the hash, images are rendered lazily on read"""
+        for record in self:
+            if record.serial_number_code:
+                record.qr_code_hash = hashlib.sha1(record._get_qr_payload().encode('utf-8')).hexdigest()
+            else:
+                record.qr_code_hash = False
+
+    @api.model
+    def _get_qr_attachment_name(self, qr_hash):
+        return f'fits_asset_qr_{qr_hash}.png'
+
+    def _get_cached_qr_images(self):
+        """Return {qr_code_hash: base64 PNG} for the QR images already cached as attachments"""
+        names = {self._get_qr_attachment_name(qr_hash): qr_hash for qr_hash in set(self.mapped('qr_code_hash')) if qr_hash}
+        if not names:
+            return {}
+        attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'qr_code_hash'),
+            ('name', 'in', list(names)),
+        ])
+        return {names[attachment.name]: attachment.datas for attachment in attachments}
+
+    @api.model
+    def _store_qr_images(self, png_by_hash):
+        """Cache rendered QR images as attachments, one per distinct payload hash
+
+        Attachments are keyed on (res_model, res_field, name) by the unique index
+        fits_asset_qr_attachment_uniq, the name carrying the payload hash. When a
+        concurrent transaction stored the same hash first, its attachment is kept.
+        """
+        Attachment = self.env['ir.attachment'].sudo()
+        vals_list = [{
+            'name': self._get_qr_attachment_name(qr_hash),
+            'res_model': self._name,
+            'res_field': 'qr_code_hash',
+            'type': 'binary',
+            'mimetype': 'image/png',
+            'raw': png,
+        } for qr_hash, png in png_by_hash.items()]
+        try:
+            with self.env.cr.savepoint():
+                Attachment.create(vals_list)
+        except psycopg2.errors.UniqueViolation:
+            self.env.invalidate_all(flush=False)
+            for vals in vals_list:
+                try:
+                    with self.env.cr.savepoint():
+                        Attachment.create(vals)
+                except psycopg2.errors.UniqueViolation:
+                    self.env.invalidate_all(flush=False)
+                    _logger.debug("QR image %s already stored by another transaction", vals['name'])
+
+    @api.autovacuum
+    def _gc_qr_images(self):
+        """Delete cached QR images whose payload hash is no longer used by any asset
+
+        Images created during the last day are kept, their assets may belong to a
+        transaction that is not committed yet.
+        """
+        self.flush_model(['qr_code_hash'])
+        self.env.cr.execute("""
+            SELECT a.id
+              FROM ir_attachment a
+             WHERE a.res_model = %(model)s
+               AND a.name LIKE %(pattern)s
+               AND a.create_date < (now() AT TIME ZONE 'UTC') - interval '1 day'
+               AND (a.res_field IS NULL
+                    OR (a.res_field = 'qr_code_hash'
+                        AND NOT EXISTS (SELECT 1
+                                          FROM fits_asset f
+                                         WHERE %(prefix)s || f.qr_code_hash || '.png' = a.name)))
+        """, {
+            'model': self._name,
+            'pattern': 'fits\\_asset\\_qr\\_%',
+            'prefix': 'fits_asset_qr_',
+        })
+        attachment_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.env['ir.attachment'].sudo().browse(attachment_ids).unlink()
+        _logger.info("Deleted %d unused cached QR images", len(attachment_ids))
+
+    def _prerender_qr_images(self, chunk_size=500):
+        """Render the missing QR images of a large recordset before printing
+
+        Payloads whose hash has no cached attachment yet are rendered in-process,
+        one chunk at a time, and every chunk is stored in bulk before the next one
+        is rendered, so the label report only reads cached images and at most one
+        chunk of PNGs is held in memory. Rendering is not forked off to worker
+        processes: forking the multithreaded server can deadlock the child on
+        locks (logging, registry, imports) held by other threads.
+        """
+        if not qrcode:
+            return 0
+        start = time.perf_counter()
+        cached = self._get_cached_qr_images()
+        payloads = {}
+        for record in self:
+            if record.qr_code_hash and record.qr_code_hash not in cached and record.qr_code_hash not in payloads:
+                payloads[record.qr_code_hash] = record._get_qr_payload()
+        if not payloads:
+            return 0
+
+        hashes = list(payloads)
+        for offset in range(0, len(hashes), chunk_size):
+            chunk = hashes[offset:offset + chunk_size]
+            self._store_qr_images(dict(zip(chunk, render_qr_pngs([payloads[qr_hash] for qr_hash in chunk]))))
+
+        elapsed = time.perf_counter() - start
+        _logger.info("Rendered %d QR images for %d assets in %.2fs (%.0f labels/s)",
+                     len(hashes), len(self), elapsed, len(hashes) / elapsed if elapsed else 0)
+        self.invalidate_recordset(['qr_code_image'])
+        return len(hashes)
+
+    @api.depends('qr_code_hash')
     def _compute_qr_code(self):
-        """Generate QR code image with asset details including name, location, and responsible person"""
+        """Generate QR code image with asset details including name, location, and responsible person
+
+        Images are content-addressed by qr_code_hash: identical payloads share one
+        attachment. An image that was not prerendered (see _prerender_qr_images) is
+        rendered on its first read and stored, so later views and prints reuse it.
+        """
+        images = self._get_cached_qr_images() if qrcode else {}
+        missing = {}
         for record in self:
-            if record.serial_number_code and qrcode:
+            qr_hash = record.qr_code_hash
+            if qr_hash and qrcode and qr_hash not in images and qr_hash not in missing:
                 try:
-                    # Create QR code with comprehensive asset information
-                    asset_code = record.serial_number_code
-                    asset_name = record.asset_name or 'N/A'
-
-                    # Get location information
-                    location_info = 'N/A'
-                    if record.location_asset_selection and record.location_asset_selection.location_name:
-                        location_info = record.location_asset_selection.location_name
-
-                    # Get responsible person information
-                    responsible_info = 'N/A'
-                    if record.responsible_person_id and record.responsible_person_id.name:
-                        responsible_info = record.responsible_person_id.name
-
-                    # Create QR text with organized layout
-                    qr_text = f'ASSET CODE: {asset_code}\n'
-                    qr_text += f'NAME ASSET: {asset_name}\n'
-                    qr_text += f'LOCATION: {location_info}\n'
-                    qr_text += f'RESPONSIBLE: {responsible_info}'
-
-                    # Generate QR code with the text
-                    qr = qrcode.QRCode(
-                        version=1,  # Keep small version, will increase if needed
-                        error_correction=qrcode.constants.ERROR_CORRECT_M,  # Medium error correction
-                        box_size=10,
-                        border=4,
-                    )
-                    qr.add_data(qr_text)
-                    qr.make(fit=True)
-
-                    # Create image
-                    img = qr.make_image(fill_color="black", back_color="white")
-
-                    # Convert to bytes
-                    img_buffer = io.BytesIO()
-                    img.save(img_buffer, format='PNG')
-                    img_bytes = img_buffer.getvalue()
-
-                    # Convert to base64
-                    record.qr_code_image = base64.b64encode(img_bytes)
-                except Exception as e:
-                    record.qr_code_image = False
-            else:
-                record.qr_code_image = False
-    
+                    missing[qr_hash] = render_qr_png(record._get_qr_payload())
+                except Exception:
+                    _logger.exception("Could not render the QR code of asset %s", record.name)
+        if missing:
+            self._store_qr_images(missing)
+            images.update((qr_hash, base64.b64encode(png)) for qr_hash, png in missing.items())
+
+        for record in self:
+            record.qr_code_image = images.get(record.qr_code_hash, False)
+
     def generate_qr_code(self):
         """Open QR Code popup with asset details"""
         self.ensure_one()
 
-        # Generate QR code if not exists
-        if not self.qr_code_image:
-            self._compute_qr_code()
+        # Store the QR image of this asset if it was not prerendered yet
+        self._prerender_qr_images()
 
         # Return action to open QR code popup
         return {
@@ -415,9 +765,8 @@ class Asset(models.Model):
         """Generate PDF label with QR code and asset information"""
         self.ensure_one()
 
-        # Generate QR code if not exists
-        if not self.qr_code_image:
-            self._compute_qr_code()
+        # Store the QR image of this asset if it was not prerendered yet
+        self._prerender_qr_images()
 
         # Return action to generate PDF using the report action
         return self.env.ref('fits_assets_maintenance.action_report_asset_qr_label').report_action(self)
@@ -468,24 +817,14 @@ class Asset(models.Model):
     @api.onchange('main_asset_selection')
     def _onchange_main_asset_category_domain(self):
         """Update category domain when main asset selection changes"""
-        if self.main_asset_selection:
-            # Filter categories for the selected Main Asset
-            main_asset_id = self.main_asset_selection.id
-            domain = [('main_asset_id', '=', main_asset_id)]
-
-            print(f"DEBUG: Filtering categories for Main Asset {self.main_asset_selection.display_name} (ID: {main_asset_id})")
-            print(f"DEBUG: Domain: {domain}")
-
-            # Clear current category selection to force user to select from filtered options
-            self.category_id = False
-
+        # Clear current category selection to force user to select from filtered options
+        self.category_id = False
+        category_ids = self.env['fits.asset.category']._get_category_ids_by_main_asset()
+        if self.main_asset_selection and category_ids.get(self.main_asset_selection.id):
             # Return domain for immediate filtering in the UI
-            return {'domain': {'category_id': domain}}
-        else:
-            # No Main Asset selected - show empty selection
-            print("DEBUG: No Main Asset selected - clearing category domain")
-            self.category_id = False
-            return {'domain': {'category_id': [('id', '=', False)]}}
+            return {'domain': {'category_id': [('main_asset_id', '=', self.main_asset_selection.id)]}}
+        # No Main Asset selected or no categories - show empty selection
+        return {'domain': {'category_id': [('id', '=', False)]}}
 
     @api.onchange('main_asset_selection')
     def _onchange_main_asset_selection(self):
@@ -500,66 +839,15 @@ class Asset(models.Model):
 
     def _assign_unique_counter_to_existing_records(self):
         """Assign unique counters to existing asset records that don't have one"""
-        existing_assets_without_counter = self.env['fits.asset'].search([
-            ('unique_counter', '=', False),
-            ('serial_number_code', '!=', False)
-        ])
-
-        for asset in existing_assets_without_counter:
-            # Extract counter from existing serial_number_code
-            if asset.serial_number_code:
-                counter_match = re.search(r'\d{4}$', asset.serial_number_code)
-                if counter_match:
-                    try:
-                        extracted_counter = int(counter_match.group())
-                        # Verify this counter is not already used by another asset
-                        existing_counter = self.env['fits.asset'].search([
-                            ('unique_counter', '=', extracted_counter),
-                            ('id', '!=', asset.id)
-                        ], limit=1)
-
-                        if existing_counter:
-                            # Counter already exists, assign a new one
-                            asset.unique_counter = self._get_next_unique_counter()
-                        else:
-                            # Use extracted counter
-                            asset.unique_counter = extracted_counter
-                    except:
-                        # If extraction fails, assign a new counter
-                        asset.unique_counter = self._get_next_unique_counter()
-                else:
-                    # No counter found in code, assign a new one
-                    asset.unique_counter = self._get_next_unique_counter()
-
-        # Ensure no duplicate counters exist
-        self._resolve_duplicate_counters()
+        self._backfill_unique_counters()
 
     def _resolve_duplicate_counters(self):
         """Resolve any duplicate unique counters in the system"""
-        # Find all assets with unique counters
-        assets_with_counters = self.env['fits.asset'].search([
-            ('unique_counter', '>', 0)
-        ])
-
-        # Group by counter value
-        counter_groups = {}
-        for asset in assets_with_counters:
-            counter = asset.unique_counter
-            if counter not in counter_groups:
-                counter_groups[counter] = []
-            counter_groups[counter].append(asset)
-
-        # Resolve duplicates
-        for counter, assets in counter_groups.items():
-            if len(assets) > 1:
-                # Multiple assets have the same counter - keep the first one, reassign others
-                for i, asset in enumerate(assets[1:], 1):
-                    asset.unique_counter = self._get_next_unique_counter()
+        self._backfill_unique_counters()
 
     @api.model
-    def create(self, vals):
-        """Create method - assign unique counter for new assets"""
-        # Clear recurrence settings if maintenance_required is set to False
+    def _normalize_recurrence_vals(self, vals):
+        """Clear recurrence settings in vals if maintenance_required is set to False"""
         if 'maintenance_required' in vals and not vals['maintenance_required']:
             vals.update({
                 'recurrence_pattern': 'none',
@@ -567,26 +855,33 @@ class Asset(models.Model):
                 'recurrence_interval': False,
                 'recurrence_end_date': False
             })
+        return vals
 
-        # Create the record first
-        result = super(Asset, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create method - assign unique counters and serial codes for new assets
 
-        # Assign unique counter if not already set (for new assets)
-        if not result.unique_counter:
-            result.unique_counter = self._get_next_unique_counter()
+        Everything is resolved on vals_list before a single batched INSERT so that
+        bulk imports don't pay a second UPDATE per row, and the stored QR code is
+        computed exactly once per new record.
+        """
+        for vals in vals_list:
+            self._normalize_recurrence_vals(vals)
 
-        return result
+        # Reserve one contiguous block of counters for the whole batch and set them
+        # before the INSERT instead of writing them back afterwards
+        vals_without_counter = [vals for vals in vals_list if not vals.get('unique_counter')]
+        counters = self._reserve_unique_counters(len(vals_without_counter))
+        for vals, counter in zip(vals_without_counter, counters):
+            vals['unique_counter'] = counter
+
+        self._prepare_serial_number_codes(vals_list)
+
+        return super(Asset, self).create(vals_list)
 
     def write(self, vals):
         """Write method - handle changes and manage calendar events"""
-        # Clear recurrence settings if maintenance_required is set to False
-        if 'maintenance_required' in vals and not vals['maintenance_required']:
-            vals.update({
-                'recurrence_pattern': 'none',
-                'recurrence_start_date': False,
-                'recurrence_interval': False,
-                'recurrence_end_date': False
-            })
+        self._normalize_recurrence_vals(vals)
 
         # Ensure maintenance_required stays True if it was True and not explicitly changed
         for asset in self:
@@ -601,28 +896,29 @@ class Asset(models.Model):
         old_recurrence_interval = {asset.id: asset.recurrence_interval for asset in self}
         old_recurrence_end_date = {asset.id: asset.recurrence_end_date for asset in self}
         old_next_maintenance_date = {asset.id: asset.next_maintenance_date for asset in self}
+        old_serial_codes = set(self.mapped('serial_number_code'))
 
         result = super(Asset, self).write(vals)
+        self._invalidate_scan_cache(old_serial_codes | set(self.mapped('serial_number_code')))
 
         # Handle calendar events after write
+        assets_to_sync = self.browse()
         for asset in self:
             asset_id = asset.id
 
             # If maintenance_required changed to False, remove from calendar
             if old_maintenance_required.get(asset_id, False) and not asset.maintenance_required:
-                print(f"DEBUG: Asset {asset.name} maintenance_required changed to False, removing from calendar")
                 calendar_events = self.env['fits.maintenance.calendar'].search([('asset_id', '=', asset_id)])
                 calendar_events.unlink()
                 continue
 
             # If status changed from maintenance to something else, remove from calendar
             if old_status.get(asset_id) == 'maintenance' and asset.status != 'maintenance':
-                print(f"DEBUG: Asset {asset.name} status changed from maintenance to {asset.status}, removing from calendar")
                 calendar_events = self.env['fits.maintenance.calendar'].search([('asset_id', '=', asset_id)])
                 calendar_events.unlink()
                 continue
 
-            # Only create/update calendar events if recurrence settings actually changed or this is a new qualifying asset
+            # Only sync calendar events if recurrence settings actually changed
             recurrence_settings_changed = (
                 old_recurrence_pattern.get(asset_id) != asset.recurrence_pattern or
                 old_recurrence_start_date.get(asset_id) != asset.recurrence_start_date or
@@ -631,15 +927,14 @@ class Asset(models.Model):
                 old_next_maintenance_date.get(asset_id) != asset.next_maintenance_date
             )
 
-            # If conditions are met and settings changed, create/update calendar events
             if (asset.status == 'maintenance' and
                 asset.maintenance_required and
-                asset.recurrence_pattern != 'none' and
-                asset.recurrence_start_date and
-                (asset.recurrence_interval or asset.recurrence_end_date) and
                 recurrence_settings_changed):
-                print(f"DEBUG: Asset {asset.name} recurrence settings changed, creating/updating calendar events")
-                self.env['fits.maintenance.calendar'].create_calendar_events()
+                assets_to_sync |= asset
+
+        # Create/remove the calendar events of the changed assets only
+        if assets_to_sync:
+            self.env['fits.maintenance.calendar'].sync_asset_events(assets_to_sync)
 
         return result
 
@@ -698,140 +993,41 @@ class Asset(models.Model):
             raise UserError('Please set a Start Date before generating schedule.')
         
         if not self.recurrence_interval and not self.recurrence_end_date:
-            raise UserError('Please set either Interval (days) or End Date before generating schedule.')
+            raise UserError('Please set either Interval (number of occurrences) or End Date before generating schedule.')
         
-        # Delete existing calendar events and draft maintenance requests for this asset
-        existing_events = self.env['fits.maintenance.calendar'].search([
-            ('asset_id', '=', self.id)
-        ])
-        if existing_events:
-            existing_events.unlink()
-        
-        # Delete existing auto-generated draft maintenance requests for this asset
+        # Remove only what no longer matches the recurrence: auto-generated draft requests
+        # and their calendar events on dates that are not occurrences anymore
+        # Only the rolling horizon [today, horizon] is generated, past occurrences are never created
+        date_from = max(self.recurrence_start_date, fields.Date.context_today(self))
+        horizon_date = self._get_schedule_horizon_date()
         existing_auto_requests = self.env['fits.maintenance.request'].search([
             ('asset_id', '=', self.id),
             ('state', '=', 'draft'),
             ('auto_generated', '=', True)
         ])
-        if existing_auto_requests:
-            existing_auto_requests.unlink()
-        
-        # Generate maintenance dates based on recurrence settings
-        maintenance_dates = []
-        
-        if self.recurrence_pattern == 'daily':
-            if self.recurrence_interval and self.recurrence_interval > 0:
-                # Generate dates based on interval
-                current_date = self.recurrence_start_date
-                for i in range(self.recurrence_interval):
-                    maintenance_dates.append(current_date)
-                    current_date = current_date + timedelta(days=1)
-            elif self.recurrence_end_date:
-                # Generate dates from start to end date
-                current_date = self.recurrence_start_date
-                while current_date <= self.recurrence_end_date:
-                    maintenance_dates.append(current_date)
-                    current_date = current_date + timedelta(days=1)
-        
-        elif self.recurrence_pattern == 'weekly':
-            if self.recurrence_interval and self.recurrence_interval > 0:
-                # Generate weekly dates based on interval count
-                current_date = self.recurrence_start_date
-                for i in range(self.recurrence_interval):
-                    maintenance_dates.append(current_date)
-                    current_date = current_date + timedelta(weeks=1)
-            elif self.recurrence_end_date:
-                # Generate weekly dates from start to end date
-                current_date = self.recurrence_start_date
-                while current_date <= self.recurrence_end_date:
-                    maintenance_dates.append(current_date)
-                    current_date = current_date + timedelta(weeks=1)
-        
-        elif self.recurrence_pattern == 'monthly':
-            if self.recurrence_interval and self.recurrence_interval > 0:
-                # Generate monthly dates based on interval count
-                current_date = self.recurrence_start_date
-                for i in range(self.recurrence_interval):
-                    maintenance_dates.append(current_date)
-                    # Add 1 month
-                    try:
-                        if current_date.month == 12:
-                            current_date = current_date.replace(year=current_date.year + 1, month=1)
-                        else:
-                            current_date = current_date.replace(month=current_date.month + 1)
-                    except ValueError:
-                        # Handle day overflow (e.g., Jan 31 -> Feb 31 doesn't exist)
-                        if current_date.month == 12:
-                            current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-                        else:
-                            current_date = current_date.replace(month=current_date.month + 1, day=1)
-            elif self.recurrence_end_date:
-                # Generate monthly dates from start to end date
-                current_date = self.recurrence_start_date
-                while current_date <= self.recurrence_end_date:
-                    maintenance_dates.append(current_date)
-                    # Add 1 month
-                    try:
-                        if current_date.month == 12:
-                            current_date = current_date.replace(year=current_date.year + 1, month=1)
-                        else:
-                            current_date = current_date.replace(month=current_date.month + 1)
-                    except ValueError:
-                        # Handle day overflow
-                        if current_date.month == 12:
-                            current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-                        else:
-                            current_date = current_date.replace(month=current_date.month + 1, day=1)
-        
-        elif self.recurrence_pattern == 'yearly':
-            if self.recurrence_interval and self.recurrence_interval > 0:
-                # Generate yearly dates based on interval count
-                current_date = self.recurrence_start_date
-                for i in range(self.recurrence_interval):
-                    maintenance_dates.append(current_date)
-                    try:
-                        current_date = current_date.replace(year=current_date.year + 1)
-                    except ValueError:
-                        # Handle leap year issues (Feb 29)
-                        current_date = current_date.replace(year=current_date.year + 1, day=28)
-            elif self.recurrence_end_date:
-                # Generate yearly dates from start to end date
-                current_date = self.recurrence_start_date
-                while current_date <= self.recurrence_end_date:
-                    maintenance_dates.append(current_date)
-                    try:
-                        current_date = current_date.replace(year=current_date.year + 1)
-                    except ValueError:
-                        # Handle leap year issues
-                        current_date = current_date.replace(year=current_date.year + 1, day=28)
-        
-        # Create calendar events and maintenance requests for each maintenance date
-        events_created = 0
-        requests_created = 0
-        
-        for maintenance_date in maintenance_dates:
-            # Create calendar event
-            calendar_event = self.env['fits.maintenance.calendar'].create({
-                'asset_id': self.id,
-                'maintenance_date': maintenance_date,
-                'hasil_status': 'draft',
-            })
-            events_created += 1
-            
-            # Create maintenance request with draft status (auto-generated)
-            maintenance_request = self.env['fits.maintenance.request'].create({
-                'asset_id': self.id,
-                'scheduled_date': maintenance_date,
-                'user_id': self.responsible_person_id.user_id.id if self.responsible_person_id and self.responsible_person_id.user_id else self.env.user.id,
-                'team_id': self.maintenance_team_id.id if self.maintenance_team_id else False,
-                'maintenance_request_title': f'Scheduled - {self.name}',
-                'description': f'Auto-generated maintenance scheduled on {maintenance_date}',
-                'maintenance_type': 'preventive',
-                'state': 'draft',
-                'auto_generated': True,  # Mark as auto-generated
-            })
-            requests_created += 1
-        
+        scheduled_dates = existing_auto_requests.mapped('scheduled_date')
+        occurrences = set(self._iter_maintenance_occurrences(
+            min(scheduled_dates + [date_from]), max(scheduled_dates + [horizon_date])))
+        stale_requests = existing_auto_requests.filtered(lambda r: r.scheduled_date not in occurrences)
+        stale_dates = set(stale_requests.mapped('scheduled_date'))
+        if stale_requests:
+            stale_requests.unlink()
+
+        remaining_request_dates = set(self.env['fits.maintenance.request'].search([
+            ('asset_id', '=', self.id),
+        ]).mapped('scheduled_date'))
+        stale_events = self.env['fits.maintenance.calendar'].search([
+            ('asset_id', '=', self.id),
+            ('hasil_status', 'in', ['draft', False]),
+        ]).filtered(lambda e: e.maintenance_date not in occurrences
+                    and (e.maintenance_date in stale_dates or e.maintenance_date not in remaining_request_dates))
+        if stale_events:
+            stale_events.unlink()
+
+        # Generate calendar events and maintenance requests up to the scheduling horizon only;
+        # the rolling horizon cron materialises later occurrences
+        events_created, requests_created = self._materialize_maintenance_schedule(date_from, horizon_date)
+
         # Set maintenance_required to True when generating schedule
         self.write({'maintenance_required': True})
         
@@ -847,6 +1043,106 @@ class Asset(models.Model):
             }
         }
 
+    @api.model
+    def _get_schedule_horizon_date(self):
+        """Last date materialised by schedule generation (today + configured horizon in days)"""
+        horizon_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'fits_assets_maintenance.schedule_horizon_days', 60))
+        return fields.Date.context_today(self) + timedelta(days=horizon_days)
+
+    def _materialize_maintenance_schedule(self, date_from, date_to):
+        """Create calendar events and draft maintenance requests for occurrences in [date_from, date_to]
+
+        Values for every asset of the recordset are collected first; events are
+        upserted in one batch and requests created with one batched create().
+        Requests already generated for an asset and date (the idempotency key of
+        auto-generated requests) are skipped, so re-runs are no-ops.
+        Returns (events created, requests created).
+        """
+        Calendar = self.env['fits.maintenance.calendar']
+        existing_keys = self.env['fits.maintenance.request']._get_auto_generated_keys(self.ids, date_from, date_to)
+        event_vals_list = []
+        request_vals_list = []
+        for asset in self:
+            user_id = asset.responsible_user_id.id or self.env.user.id
+            for maintenance_date in asset._iter_maintenance_occurrences(date_from, date_to):
+                # Calendar event
+                event_vals_list.append(Calendar._prepare_event_vals(asset.id, maintenance_date))
+                if (asset.id, maintenance_date) in existing_keys:
+                    continue
+                # Maintenance request with draft status (auto-generated)
+                request_vals_list.append({
+                    'asset_id': asset.id,
+                    'scheduled_date': maintenance_date,
+                    'user_id': user_id,
+                    'team_id': asset.maintenance_team_id.id if asset.maintenance_team_id else False,
+                    'maintenance_request_title': f'Scheduled - {asset.name}',
+                    'description': f'Auto-generated maintenance scheduled on {maintenance_date}',
+                    'maintenance_type': 'preventive',
+                    'state': 'draft',
+                    'auto_generated': True,  # Mark as auto-generated
+                })
+
+        # Events already present for an asset and date (e.g. from a request) are kept as they are
+        events = Calendar._upsert_events(event_vals_list)
+        requests_created = self._create_auto_generated_requests(request_vals_list)
+        super(Asset, self).write({'schedule_materialized_until': date_to})
+        return len(events), requests_created
+
+    @api.model
+    def _create_auto_generated_requests(self, request_vals_list):
+        """Create auto-generated maintenance requests, skipping those generated concurrently
+
+        The partial unique index fits_maintenance_request_auto_generated_uniq rejects a
+        second auto-generated request for an asset and date. The batch is created in a
+        savepoint; when a concurrent run inserted some of the keys first, every asset is
+        retried in its own savepoint and the assets that collide again are left to the
+        run that created them. Returns the number of requests created.
+        """
+        if not request_vals_list:
+            return 0
+        Request = self.env['fits.maintenance.request'].with_context(mail_create_nolog=True)
+        try:
+            with self.env.cr.savepoint():
+                return len(Request.create([dict(vals) for vals in request_vals_list]))
+        except psycopg2.errors.UniqueViolation:
+            self.env.invalidate_all(flush=False)
+
+        vals_by_asset = defaultdict(list)
+        for vals in request_vals_list:
+            vals_by_asset[vals['asset_id']].append(vals)
+        created = 0
+        for asset_id, vals_list in vals_by_asset.items():
+            try:
+                with self.env.cr.savepoint():
+                    created += len(Request.create([dict(vals) for vals in vals_list]))
+            except psycopg2.errors.UniqueViolation:
+                self.env.invalidate_all(flush=False)
+                _logger.info("Maintenance requests of asset %s were generated concurrently, skipped", asset_id)
+        return created
+
+    @api.model
+    def _cron_extend_maintenance_schedule(self, batch_size=200):
+        """Rolling horizon cron: materialise occurrences up to today + horizon for generated schedules"""
+        today = fields.Date.context_today(self)
+        horizon_date = self._get_schedule_horizon_date()
+        assets = self.search([
+            ('schedule_materialized_until', '!=', False),
+            ('schedule_materialized_until', '<', horizon_date),
+            ('maintenance_required', '=', True),
+            ('recurrence_pattern', '!=', 'none'),
+            ('recurrence_start_date', '!=', False),
+        ])
+        for offset in range(0, len(assets), batch_size):
+            batch = self.browse(assets.ids[offset:offset + batch_size])
+            # Group by previous horizon so every asset continues right after its last materialised date
+            # (or from today, when the cron did not run for longer than the horizon)
+            for materialized_until in set(batch.mapped('schedule_materialized_until')):
+                batch.filtered(lambda a: a.schedule_materialized_until == materialized_until)._materialize_maintenance_schedule(
+                    max(materialized_until + timedelta(days=1), today), horizon_date)
+            self.env.cr.commit()
+            batch.invalidate_recordset()
+
     def action_view_maintenance_calendar(self):
         """Open maintenance calendar for this asset"""
         self.ensure_one()
@@ -883,4 +1179,5 @@ class Asset(models.Model):
         for record in self:
             if record.status in ['active', 'maintenance']:
                 raise UserError(f"Cannot delete Asset '{record.name}' because it is {record.status}. Only Draft assets can be deleted.")
+        self._invalidate_scan_cache(set(self.mapped('serial_number_code')))
         return super(Asset, self).unlink()
@@ -1,4 +1,4 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 import random
 
 class AssetCategory(models.Model):
@@ -32,9 +32,25 @@ class AssetCategory(models.Model):
             return self.env['fits.main.assets']._name_search(name, args, operator, limit, name_get_uid)
         return super(AssetCategory, self)._name_search(name, args, operator, limit, name_get_uid)
 
+    @api.model
+    @tools.ormcache()
+    def _get_category_ids_by_main_asset(self):
+        """Return {main asset id: tuple of category ids}, cached in the registry
+
+        The cache is cleared when a category is created or deleted, or when its
+        main_asset_id is written; other writes keep it.
+        The returned dict is shared between calls and must not be modified.
+        """
+        return {
+            main_asset.id: tuple(category_ids)
+            for main_asset, category_ids in self.sudo()._read_group(
+                [], groupby=['main_asset_id'], aggregates=['id:array_agg'])
+        }
+
     @api.model
     def create(self, vals):
         result = super(AssetCategory, self).create(vals)
+        self.env.registry.clear_cache()
         return result
 
     def write(self, vals):
@@ -46,4 +62,15 @@ class AssetCategory(models.Model):
             else:
                 # If main asset exists, don't allow category code change
                 vals.pop('category_code', None)
-        return super(AssetCategory, self).write(vals)
\ No newline at end of file
+        result = super(AssetCategory, self).write(vals)
+        if 'main_asset_id' in vals:
+            self.env.registry.clear_cache()
+        # Regenerate serial number codes of every asset using these categories
+        if 'category_code' in vals:
+            self.env['fits.asset']._regenerate_serial_codes('category_id', self.ids)
+        return result
+
+    def unlink(self):
+        result = super(AssetCategory, self).unlink()
+        self.env.registry.clear_cache()
+        return result
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+
+try:
+    from reportlab.graphics import renderPDF
+    from reportlab.graphics.barcode.qr import QrCodeWidget
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib.pagesizes import A4, LETTER
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+except ImportError:
+    canvas = None
+
+_logger = logging.getLogger(__name__)
+
+
+class AssetLabelLayout(models.Model):
+    _name = 'fits.asset.label.layout'
+    _description = 'Asset QR Label Layout'
+    _order = 'name'
+
+    name = fields.Char(string='Name', required=True)
+    paper_format = fields.Selection([
+        ('a4', 'A4'),
+        ('letter', 'Letter')
+    ], string='Paper Format', default='a4', required=True)
+    rows = fields.Integer(string='Rows', default=8, required=True)
+    columns = fields.Integer(string='Columns', default=3, required=True)
+    margin_top = fields.Float(string='Top Margin (mm)', default=10.0)
+    margin_bottom = fields.Float(string='Bottom Margin (mm)', default=10.0)
+    margin_left = fields.Float(string='Left Margin (mm)', default=7.0)
+    margin_right = fields.Float(string='Right Margin (mm)', default=7.0)
+    spacing_horizontal = fields.Float(string='Horizontal Spacing (mm)', default=2.0,
+                                      help='Gap between two labels of the same row')
+    spacing_vertical = fields.Float(string='Vertical Spacing (mm)', default=0.0,
+                                    help='Gap between two rows of labels')
+    font_size = fields.Integer(string='Font Size', default=7)
+    active = fields.Boolean(string='Active', default=True)
+
+    @api.constrains('rows', 'columns')
+    def _check_grid(self):
+        for record in self:
+            if record.rows <= 0 or record.columns <= 0:
+                raise ValidationError(_('Rows and Columns must be greater than zero.'))
+
+    def _get_label_boxes(self):
+        """Return page size and the (x, y, width, height) box of every label of a page, in points"""
+        self.ensure_one()
+        page_width, page_height = A4 if self.paper_format == 'a4' else LETTER
+        usable_width = page_width - (self.margin_left + self.margin_right + self.spacing_horizontal * (self.columns - 1)) * mm
+        usable_height = page_height - (self.margin_top + self.margin_bottom + self.spacing_vertical * (self.rows - 1)) * mm
+        label_width = usable_width / self.columns
+        label_height = usable_height / self.rows
+        if label_width <= 0 or label_height <= 0:
+            raise UserError(_('Label layout "%s" does not fit on the page. Reduce margins or spacing.') % self.name)
+
+        boxes = []
+        for row in range(self.rows):
+            for column in range(self.columns):
+                x = self.margin_left * mm + column * (label_width + self.spacing_horizontal * mm)
+                y = page_height - self.margin_top * mm - (row + 1) * label_height - row * self.spacing_vertical * mm
+                boxes.append((x, y, label_width, label_height))
+        return (page_width, page_height), boxes
+
+    def _draw_label(self, pdf, box, payload, title, code):
+        """Draw one label: vector QR code on the left, asset name and code on the right"""
+        x, y, width, height = box
+        padding = 1.5 * mm
+        qr_size = min(height, width / 2) - 2 * padding
+
+        widget = QrCodeWidget(payload, barLevel='M')
+        bounds = widget.getBounds()
+        drawing = Drawing(qr_size, qr_size, transform=[
+            qr_size / (bounds[2] - bounds[0]), 0, 0, qr_size / (bounds[3] - bounds[1]), 0, 0,
+        ])
+        drawing.add(widget)
+        renderPDF.draw(drawing, pdf, x + padding, y + (height - qr_size) / 2)
+
+        text_x = x + qr_size + 2 * padding
+        max_chars = max(int((width - qr_size - 3 * padding) / (self.font_size * 0.5)), 1)
+        pdf.setFont('Helvetica-Bold', self.font_size)
+        pdf.drawString(text_x, y + height / 2 + 1, (title or '')[:max_chars])
+        pdf.setFont('Helvetica', self.font_size)
+        pdf.drawString(text_x, y + height / 2 - self.font_size - 1, (code or '')[:max_chars])
+
+    def _render_labels_pdf(self, assets, output, batch_size=1000):
+        """Render QR labels of assets as a vector PDF into the binary file object output
+
+        Assets are read in batches and evicted from the cache, QR codes are drawn
+        as vector paths instead of embedded PNGs and every page is closed and
+        compressed as soon as it is full, so memory stays flat for large runs.
+        The PDF is never held in memory as a whole: callers stream output (e.g. a
+        temporary file) to the client. Returns the number of labels rendered.
+        """
+        self.ensure_one()
+        if not canvas:
+            raise UserError(_('The Python library reportlab is required to print vector labels.'))
+
+        start = time.perf_counter()
+        page_size, boxes = self._get_label_boxes()
+        pdf = canvas.Canvas(output, pagesize=page_size, pageCompression=1)
+        position = 0
+        rendered = 0
+        for offset in range(0, len(assets), batch_size):
+            # Fresh browse so that prefetching is limited to the current batch
+            batch = assets.browse(assets.ids[offset:offset + batch_size])
+            for asset in batch:
+                if not asset.serial_number_code:
+                    continue
+                if position == len(boxes):
+                    pdf.showPage()
+                    position = 0
+                self._draw_label(pdf, boxes[position], asset._get_qr_payload(),
+                                 asset.asset_name or asset.name, asset.serial_number_code)
+                position += 1
+                rendered += 1
+            batch.invalidate_recordset()
+        pdf.showPage()
+        pdf.save()
+
+        elapsed = time.perf_counter() - start
+        _logger.info("Rendered %d vector QR labels (%d assets selected) in %.2fs (%.0f labels/s)",
+                     rendered, len(assets), elapsed, rendered / elapsed if elapsed else 0)
+        return rendered
@@ -14,6 +14,19 @@ class AssetQRReportWizard(models.TransientModel):
         ('all', 'All Assets')
     ], string='Selection Mode', required=True)
 
+    # Output format: HTML report (wkhtmltopdf) or direct vector PDF on label stock
+    output_format = fields.Selection([
+        ('html', 'Standard Report'),
+        ('vector', 'Vector Label Sheet')
+    ], string='Output', default='html', required=True)
+
+    label_layout_id = fields.Many2one(
+        'fits.asset.label.layout',
+        string='Label Layout',
+        default=lambda self: self.env['fits.asset.label.layout'].search([], limit=1),
+        help='Label stock (rows, columns and margins) used for the vector label sheet'
+    )
+
     # Optional date filters (used for category/all per requirements)
     date_start = fields.Date(string='Start Date')
     date_end = fields.Date(string='End Date')
@@ -130,8 +143,24 @@ class AssetQRReportWizard(models.TransientModel):
         record._compute_available_categories()
         return record
 
-    def action_print_qr_labels(self):
-        """Print QR labels for selected assets"""
+    def _print_labels(self, assets):
+        """Return the print action for assets in the selected output format"""
+        if self.output_format == 'vector':
+            if not self.label_layout_id:
+                raise UserError(_('Please select a Label Layout.'))
+            # Rendered and streamed from a temporary file by the download route
+            return {
+                'type': 'ir.actions.act_url',
+                'url': f'/fits_assets_maintenance/qr_labels/{self.id}',
+                'target': 'self',
+            }
+
+        # Generate QR codes for assets if they don't have them
+        assets._prerender_qr_images()
+        return self.env.ref('fits_assets_maintenance.action_report_asset_qr_label').report_action(assets)
+
+    def _get_assets_to_print(self):
+        """Return the assets selected by the wizard, raising UserError when the selection is invalid"""
         if self.selection_mode == 'all':
             # All requires start and end date
             if not (self.date_start and self.date_end):
@@ -143,17 +172,10 @@ class AssetQRReportWizard(models.TransientModel):
                       ('acquisition_date', '<=', self.date_end)]
             assets_to_process = self.env['fits.asset'].search(domain)
 
-            # Generate QR codes for all assets if they don't have them
-            for asset in assets_to_process:
-                if not asset.qr_code_image:
-                    asset._compute_qr_code()
-
-            # Return the report action for all assets
-            if assets_to_process:
-                return self.env.ref('fits_assets_maintenance.action_report_asset_qr_label').report_action(assets_to_process)
-            else:
+            if not assets_to_process:
                 # No assets available
                 raise UserError(_('No assets found for the selected criteria.'))
+            return assets_to_process
 
         elif self.selection_mode == 'category':
             # Category mode - require categories
@@ -167,16 +189,9 @@ class AssetQRReportWizard(models.TransientModel):
                 domain.append(('acquisition_date', '<=', self.date_end))
             assets_to_process = self.env['fits.asset'].search(domain)
 
-            # Generate QR codes for selected assets if they don't have them
-            for asset in assets_to_process:
-                if not asset.qr_code_image:
-                    asset._compute_qr_code()
-
-            # Return the report action for the selected assets
-            if assets_to_process:
-                return self.env.ref('fits_assets_maintenance.action_report_asset_qr_label').report_action(assets_to_process)
-            else:
+            if not assets_to_process:
                 raise UserError(_('No assets found for the selected criteria.'))
+            return assets_to_process
 
         elif self.selection_mode == 'manual':
             # Manual mode - require selected assets
@@ -195,10 +210,9 @@ class AssetQRReportWizard(models.TransientModel):
                             # If generation fails, continue with other assets
                             pass
 
-            # Generate QR codes for selected assets if they don't have them
-            for asset in assets_to_process:
-                if not asset.qr_code_image:
-                    asset._compute_qr_code()
+            return assets_to_process
+        return self.env['fits.asset']
 
-            # Return the report action for the selected assets
-            return self.env.ref('fits_assets_maintenance.action_report_asset_qr_label').report_action(assets_to_process)
+    def action_print_qr_labels(self):
+        """Print QR labels for selected assets"""
+        return self._print_labels(self._get_assets_to_print())
@@ -12,7 +12,7 @@ class AssetTransfer(models.Model, MailThread):
     _inherit = ['mail.thread', 'mail.activity.mixin']
     
     # Auto-generated transfer reference with format ATF/YYYY/0001
-    name = fields.Char(default='New', readonly=True, copy=False)
+    name = fields.Char(default='New', readonly=True, copy=False, index=True)
 
     # Display name combining asset name and transfer reference
     display_name = fields.Char(string='Display Name', compute='_compute_display_name', store=True)
@@ -21,7 +21,7 @@ class AssetTransfer(models.Model, MailThread):
     asset_id = fields.Many2one('fits.asset', string='Asset', required=True,
                               domain=[('status', '=', 'active')])
 
-    transfer_date = fields.Date(string='Transfer Date', default=fields.Date.today)
+    transfer_date = fields.Date(string='Transfer Date', default=fields.Date.today, index=True)
     from_location = fields.Char(string='From Location', compute='_compute_from_location', store=True)
     to_location = fields.Many2one('fits.location.assets', string='To Location')
 
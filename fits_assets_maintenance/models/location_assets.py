@@ -19,3 +19,10 @@ class LocationAssets(models.Model):
         required=True,
         help='Nama lokasi dimasukkan manual oleh user'
     )
+
+    def write(self, vals):
+        result = super(LocationAssets, self).write(vals)
+        # Regenerate serial number codes of every asset stored at these locations
+        if 'location_code' in vals:
+            self.env['fits.asset']._regenerate_serial_codes('location_asset_selection', self.ids)
+        return result
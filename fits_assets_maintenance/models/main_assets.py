@@ -69,3 +69,10 @@ class MainAssets(models.Model):
     @api.model
     def create(self, vals):
         return super(MainAssets, self).create(vals)
+
+    def write(self, vals):
+        result = super(MainAssets, self).write(vals)
+        # Regenerate serial number codes of every asset using these Main Assets
+        if 'asset_code' in vals:
+            self.env['fits.asset']._regenerate_serial_codes('main_asset_selection', self.ids)
+        return result
@@ -1,8 +1,33 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
+from odoo.tools.translate import _lt
 from odoo.exceptions import UserError, ValidationError
+import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+_logger = logging.getLogger(__name__)
+
+# Allowed Kanban state transitions: current state -> (reachable states, error message)
+STATE_TRANSITIONS = {
+    'done': (['done'], _lt("You cannot modify a maintenance request that is already marked as Done.")),
+    'cancelled': (['draft'], _lt("You can only move to Draft from the Cancelled status.")),
+    'draft': (['in_progress', 'cancelled'], _lt("You can only move from Draft to In Progress or Cancelled.")),
+    'in_progress': (['done', 'repaired', 'cancelled'], _lt("You can only move from In Progress to Repaired or Cancelled.")),
+    'repaired': (['done', 'cancelled'], _lt("You can only move from Repaired to Done or Cancelled.")),
+}
+
+# Values written on the asset when a request moves to a state
+# (Done and Draft depend on the asset recurrence, see _get_asset_values_for_state)
+ASSET_VALUES_BY_STATE = {
+    'in_progress': {'status': 'maintenance', 'maintenance_required': True},
+    'repaired': {'status': 'maintenance', 'maintenance_required': True},
+    'cancelled': {'status': 'active', 'maintenance_required': False},
+}
+
+# Number of requests written (and committed) at once by the bulk transition actions
+BULK_TRANSITION_CHUNK_SIZE = 500
+
 
 class MaintenanceRequest(models.Model):
     _name = 'fits.maintenance.request'
@@ -18,7 +43,7 @@ class MaintenanceRequest(models.Model):
         'fits.asset',
         string='Asset',
         required=True,
-        domain="[('responsible_person_id.user_id', '=', user_id)]",
+        domain="[('responsible_user_id', '=', user_id)]",
         help='Asset that requires maintenance'
     )
 
@@ -35,6 +60,9 @@ class MaintenanceRequest(models.Model):
     responsible_person_id = fields.Many2one('hr.employee', string='Responsible Person',
                                           related='asset_id.responsible_person_id', store=True, readonly=True)
 
+    responsible_user_id = fields.Many2one('res.users', string='Responsible User',
+                                          related='asset_id.responsible_user_id', store=True, index=True)
+
     team_id = fields.Many2one('fits.maintenance.team', string='Team', domain="[('active', '=', True)]")
 
     user_id = fields.Many2one(
@@ -61,12 +89,12 @@ class MaintenanceRequest(models.Model):
             self.asset_id = False
             return {'domain': {'asset_id': [('id', '=', False)]}}
 
-        if self.asset_id and self.asset_id.responsible_person_id.user_id != self.user_id:
+        if self.asset_id and self.asset_id.responsible_user_id != self.user_id:
             self.asset_id = False
 
         return {
             'domain': {
-                'asset_id': [('responsible_person_id.user_id', '=', self.user_id.id)]
+                'asset_id': [('responsible_user_id', '=', self.user_id.id)]
             }
         }
 
@@ -120,7 +148,7 @@ class MaintenanceRequest(models.Model):
 
     description = fields.Text(string='Description', required=True)
 
-    scheduled_date = fields.Date(string='Scheduled Start', required=True)
+    scheduled_date = fields.Date(string='Scheduled Start', required=True, index=True)
     scheduled_end_date = fields.Date(string='Scheduled End')
 
     state = fields.Selection([
@@ -159,18 +187,52 @@ class MaintenanceRequest(models.Model):
     # Auto-generated flag to identify maintenance requests created from schedule
     auto_generated = fields.Boolean(string='Auto Generated', default=False, readonly=True,
                                    help='Indicates if this maintenance request was auto-generated from schedule')
-    
+
     # Cancellation reason
     cancellation_reason = fields.Text(string='Cancellation Reason', readonly=True, copy=False,
                                     help='Reason for cancelling the maintenance request')
 
+    def init(self):
+        super().init()
+        # Per-asset lookups by status and date (calendar sync, asset history, analysis windows)
+        tools.create_index(self.env.cr, 'fits_maintenance_request_asset_state_date_index',
+                           self._table, ['asset_id', 'state', 'scheduled_date'])
+        # Idempotency key: one auto-generated request per asset and date
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS fits_maintenance_request_auto_generated_uniq
+                ON fits_maintenance_request (asset_id, scheduled_date)
+             WHERE auto_generated
+        """)
+
+    @api.model
+    def _get_auto_generated_keys(self, asset_ids, date_from=None, date_to=None):
+        """Return the (asset_id, scheduled_date) pairs that already have an auto-generated request"""
+        if not asset_ids:
+            return set()
+        self.flush_model(['asset_id', 'scheduled_date', 'auto_generated'])
+        query = """
+            SELECT asset_id, scheduled_date
+              FROM fits_maintenance_request
+             WHERE auto_generated
+               AND asset_id IN %s
+        """
+        params = [tuple(asset_ids)]
+        if date_from:
+            query += " AND scheduled_date >= %s"
+            params.append(date_from)
+        if date_to:
+            query += " AND scheduled_date <= %s"
+            params.append(date_to)
+        self.env.cr.execute(query, params)
+        return set(self.env.cr.fetchall())
+
     @api.constrains('asset_id', 'user_id')
     def _check_asset_user_alignment(self):
         for record in self:
             if (
                 record.asset_id
                 and record.user_id
-                and record.asset_id.responsible_person_id.user_id != record.user_id
+                and record.asset_id.responsible_user_id != record.user_id
             ):
                 raise ValidationError(_("The selected asset must belong to the chosen Responsible user."))
     
@@ -181,154 +243,138 @@ class MaintenanceRequest(models.Model):
                 raise ValidationError(_("⚠️ The 'Team' field is required before saving this record."))
 
     @api.model
-    def create(self, vals):
-        # Generate unique identifier for maintenance request
-        if not vals.get('maintenance_request_type'):
-            sequence_code = self.env['ir.sequence'].next_by_code('fits.maintenance.request') or 'MR'
+    def _reserve_request_numbers(self, count):
+        """Return count request numbers of the fits.maintenance.request sequence
+
+        With the standard implementation all numbers are taken from the PostgreSQL
+        sequence in one statement instead of one next_by_code() call per record.
+        """
+        if count <= 0:
+            return []
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'fits.maintenance.request'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return ['MR'] * count
+        if sequence.implementation != 'standard' or sequence.use_date_range:
+            return [sequence.next_by_id() for _i in range(count)]
+
+        self.env.cr.execute("SELECT nextval(%s) FROM generate_series(1, %s)",
+                            ('ir_sequence_%03d' % sequence.id, count))
+        return [sequence.get_next_char(number) for number, in self.env.cr.fetchall()]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Generate unique identifier for maintenance request, reserving all numbers at once
+        vals_without_number = [vals for vals in vals_list if not vals.get('maintenance_request_type')]
+        sequence_codes = self._reserve_request_numbers(len(vals_without_number))
+        for vals, sequence_code in zip(vals_without_number, sequence_codes):
             title = vals.get('maintenance_request_title', '')
             vals['maintenance_request_type'] = f"{sequence_code} - {title}" if title else sequence_code
 
-        # Create the record
-        result = super(MaintenanceRequest, self).create(vals)
-
-        # Set maintenance_required to True on the related asset (only if not draft)
-        # Draft requests are auto-generated from schedule, so maintenance_required is already set
-        if result.asset_id and result.state != 'draft':
-            result.asset_id.write({'maintenance_required': True})
+        # Create the records
+        results = super(MaintenanceRequest, self).create(vals_list)
+
+        for result in results:
+            # Set maintenance_required to True on the related asset (only if not draft)
+            # Draft requests are auto-generated from schedule, so maintenance_required is already set
+            if result.asset_id and result.state != 'draft':
+                result.asset_id.write({'maintenance_required': True})
+
+        # Update calendar for in-progress requests with scheduled date
+        in_progress = results.filtered(lambda r: r.state == 'in_progress' and r.scheduled_date)
+        if in_progress:
+            self.env['fits.maintenance.calendar'].update_calendar_for_requests(in_progress)
+
+        return results
+
+    def _update_calendar_after_write(self, old_states, vals):
+        """Update calendar events of requests whose state changed to a relevant state or whose date changed"""
+        changed = self.filtered(
+            lambda r: (old_states.get(r.id) != r.state and r.state in ['in_progress', 'repaired', 'done', 'cancelled'])
+            or 'scheduled_date' in vals
+        )
+        if changed:
+            self.env['fits.maintenance.calendar'].update_calendar_for_requests(changed)
+
+    def _check_state_transition(self, new_state):
+        """Raise if any request of the recordset cannot move to new_state"""
+        for state in set(self.mapped('state')):
+            allowed_states, message = STATE_TRANSITIONS.get(state, (None, None))
+            if allowed_states is not None and new_state not in allowed_states:
+                raise ValidationError(str(message))
+
+    def _get_asset_values_for_state(self, new_state):
+        """Return {asset: values} to write on the assets of the requests moving to new_state
+
+        Done and Draft (from Cancelled) keep maintenance_required on assets that have an
+        active recurrence. The recurrence check runs on the whole asset recordset at once.
+        """
+        assets = self.asset_id
+        if new_state in ASSET_VALUES_BY_STATE:
+            return {asset: ASSET_VALUES_BY_STATE[new_state] for asset in assets}
+        if new_state in ('done', 'draft'):
+            if new_state == 'draft':
+                # Only reverting a cancelled request changes the asset
+                assets = self.filtered(lambda r: r.state == 'cancelled').asset_id
+            recurring_assets = assets.filtered(lambda a: a.recurrence_pattern != 'none' and
+                                               a.recurrence_start_date and
+                                               (a.recurrence_interval or a.recurrence_end_date))
+            return {
+                asset: {'status': 'active', 'maintenance_required': asset in recurring_assets}
+                for asset in assets
+            }
+        return {}
 
-        # Update calendar if this is an in-progress request with scheduled date
-        if result.state == 'in_progress' and result.scheduled_date:
-            print(f"DEBUG: New in-progress maintenance request created - updating calendar")
-            self.env['fits.maintenance.calendar'].update_calendar_for_request(result.id)
+    @api.model
+    def _write_asset_values(self, values_by_asset):
+        """Write assets grouped by identical values: one write per distinct set of values
 
-        return result
+        :param values_by_asset: {fits.asset record: values dict}
+        """
+        assets_by_values = defaultdict(lambda: self.env['fits.asset'])
+        for asset, values in values_by_asset.items():
+            assets_by_values[tuple(sorted(values.items()))] |= asset
+        for values, assets in assets_by_values.items():
+            assets.write(dict(values))
 
-    def write(self, vals):
-        """Override write to update calendar when status changes"""
-        # Store old values before write
-        old_states = {record.id: record.state for record in self}
-
-        result = super(MaintenanceRequest, self).write(vals)
-
-        # Update calendar if state changed to in_progress or other relevant changes
-        for record in self:
-            old_state = old_states.get(record.id)
-            # Only update calendar if state actually changed to a relevant state or scheduled_date changed
-            if (old_state != record.state and record.state in ['in_progress', 'repaired', 'done', 'cancelled']) or 'scheduled_date' in vals:
-                # Update calendar events if state changed or relevant fields changed
-                print(f"DEBUG: Maintenance request {record.id} changed - updating calendar")
-                self.env['fits.maintenance.calendar'].update_calendar_for_request(record.id)
-
-        return result
-    
     def write(self, vals):
         """Override write to control Kanban state transitions and update related asset status."""
         old_states = {record.id: record.state for record in self}
 
-        for record in self:
-            new_state = vals.get('state')
-
-            if not new_state:
-                continue
-
-            # === 1️⃣ Prevent changes from Done ===
-            if record.state == 'done' and new_state != 'done':
-                raise ValidationError(_("You cannot modify a maintenance request that is already marked as Done."))
-
-            # === 2️⃣ Cancelled rules ===
-            if record.state == 'cancelled':
-                if new_state != 'draft':
-                    raise ValidationError(_("You can only move to Draft from the Cancelled status."))
-
-            # === 3️⃣ Draft rules ===
-            if record.state == 'draft':
-                if new_state not in ['in_progress', 'cancelled']:
-                    raise ValidationError(_("You can only move from Draft to In Progress or Cancelled."))
-
-            # === 4️⃣ In Progress rules ===
-            if record.state == 'in_progress':
-                if new_state not in ['done', 'repaired', 'cancelled']:
-                    raise ValidationError(_("You can only move from In Progress to Repaired or Cancelled."))
-
-            # === 5️⃣ Repaired rules ===
-            if record.state == 'repaired':
-                if new_state not in ['done', 'cancelled']:
-                    raise ValidationError(_("You can only move from Repaired to Done or Cancelled."))
+        new_state = vals.get('state')
+        if new_state:
+            # Validate every transition before touching any record
+            self._check_state_transition(new_state)
 
             # === Update asset status automatically ===
-            if new_state in ['in_progress', 'repaired']:
-                if record.asset_id:
-                    record.asset_id.write({
-                        'status': 'maintenance',
-                        'maintenance_required': True
-                    })
-
-            elif new_state == 'done':
-                if record.asset_id:
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': False
-                    })
-
-            elif new_state == 'cancelled':
-                if record.asset_id:
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': False
-                    })
-                # Log cancellation reason to chatter
-                if 'cancellation_reason' in vals and vals['cancellation_reason']:
+            self._write_asset_values(self._get_asset_values_for_state(new_state))
+
+            # Log cancellation reason to chatter
+            if new_state == 'cancelled' and vals.get('cancellation_reason'):
+                for record in self:
                     record.message_post(body=_('Maintenance Request Cancelled. Reason: %s') % vals['cancellation_reason'])
 
         # Save the record
         result = super(MaintenanceRequest, self).write(vals)
 
         # Update calendar events if state changed
-        for record in self:
-            old_state = old_states.get(record.id)
-            if (old_state != record.state and record.state in ['in_progress', 'repaired', 'done', 'cancelled']) or 'scheduled_date' in vals:
-                self.env['fits.maintenance.calendar'].update_calendar_for_request(record.id)
+        self._update_calendar_after_write(old_states, vals)
 
         return result
 
     def action_start_progress(self):
         """Set status to In Progress and update asset status"""
-        for record in self:
-            # Update asset status to maintenance
-            if record.asset_id:
-                record.asset_id.write({'status': 'maintenance'})
         self.write({'state': 'in_progress'})
 
     def action_mark_repaired(self):
         """Set status to Repaired and update asset status"""
-        for record in self:
-            # Update asset status to maintenance
-            if record.asset_id:
-                record.asset_id.write({'status': 'maintenance'})
         self.write({'state': 'repaired'})
 
     def action_mark_done(self):
         """Set status to Done and update asset status back to active"""
-        for record in self:
-            # Update asset status back to active
-            if record.asset_id:
-                # Check if asset has active recurrence
-                has_active_recurrence = (record.asset_id.recurrence_pattern != 'none' and
-                                       record.asset_id.recurrence_start_date and
-                                       (record.asset_id.recurrence_interval or record.asset_id.recurrence_end_date))
-                
-                if has_active_recurrence:
-                    # Keep maintenance_required as True if there's active recurrence
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': True  # Keep as True for recurrence
-                    })
-                else:
-                    # Set maintenance_required to False if no recurrence
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': False
-                    })
+        # Assets with an active recurrence keep maintenance_required (see write)
         self.write({
             'state': 'done',
             'scheduled_end_date': fields.Date.today()
@@ -336,28 +382,84 @@ class MaintenanceRequest(models.Model):
 
     def action_set_to_draft(self):
         """Set status back to Draft from Cancelled status"""
-        for record in self:
-            # If setting back to draft from cancelled, revert asset status
-            if record.state == 'cancelled' and record.asset_id:
-                # Check if asset has active recurrence
-                has_active_recurrence = (record.asset_id.recurrence_pattern != 'none' and
-                                       record.asset_id.recurrence_start_date and
-                                       (record.asset_id.recurrence_interval or record.asset_id.recurrence_end_date))
-
-                if has_active_recurrence:
-                    # Keep maintenance_required as True if there's active recurrence
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': True  # Keep as True for recurrence
-                    })
-                else:
-                    # Set maintenance_required to False if no recurrence
-                    record.asset_id.write({
-                        'status': 'active',
-                        'maintenance_required': False
-                    })
         self.write({'state': 'draft'})
 
+    def _bulk_transition(self, vals, chunk_size=BULK_TRANSITION_CHUNK_SIZE):
+        """Apply a state transition to many requests in chunks, committing after every chunk
+
+        Requests that cannot reach the target state are skipped. A failing chunk is
+        rolled back and retried request by request, so only the requests that fail
+        on their own are counted as failed.
+        Returns a notification with the processed / skipped / failed summary.
+        """
+        new_state = vals['state']
+        eligible = self.filtered(lambda r: new_state in STATE_TRANSITIONS.get(r.state, ([new_state], None))[0])
+        skipped = len(self) - len(eligible)
+        processed = failed = 0
+
+        for offset in range(0, len(eligible), chunk_size):
+            chunk = self.browse(eligible.ids[offset:offset + chunk_size])
+            chunk_processed = chunk._transition_chunk(vals)
+            processed += chunk_processed
+            failed += len(chunk) - chunk_processed
+            self.env.cr.commit()
+            chunk.invalidate_recordset()
+
+        _logger.info("Bulk transition to %s: %d processed, %d skipped, %d failed",
+                     new_state, processed, skipped, failed)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Maintenance Requests Updated'),
+                'message': _('%(processed)s processed, %(skipped)s skipped, %(failed)s failed.',
+                             processed=processed, skipped=skipped, failed=failed),
+                'type': 'warning' if failed else 'success',
+                'sticky': bool(failed),
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
+
+    def _transition_chunk(self, vals):
+        """Write vals on one chunk in a single batch, isolating failing requests if the batch fails
+
+        Returns the number of requests written.
+        """
+        try:
+            with self.env.cr.savepoint():
+                self.write(vals)
+                self.flush_recordset()
+            return len(self)
+        except Exception:
+            self.env.invalidate_all(flush=False)
+            processed = 0
+            for request in self:
+                try:
+                    with self.env.cr.savepoint():
+                        request.write(vals)
+                        request.flush_recordset()
+                    processed += 1
+                except Exception as e:
+                    self.env.invalidate_all(flush=False)
+                    _logger.warning("Bulk transition to %s failed for request %s: %s", vals['state'], request.id, e)
+            return processed
+
+    def action_bulk_start_progress(self):
+        """Server action: set the selected requests to In Progress in chunks"""
+        return self._bulk_transition({'state': 'in_progress'})
+
+    def action_bulk_mark_repaired(self):
+        """Server action: set the selected requests to Repaired in chunks"""
+        return self._bulk_transition({'state': 'repaired'})
+
+    def action_bulk_mark_done(self):
+        """Server action: set the selected requests to Done in chunks"""
+        return self._bulk_transition({'state': 'done', 'scheduled_end_date': fields.Date.today()})
+
+    def action_bulk_set_to_draft(self):
+        """Server action: set the selected cancelled requests back to Draft in chunks"""
+        return self._bulk_transition({'state': 'draft'})
+
     def action_cancel(self):
         """Open the cancellation wizard for the maintenance request"""
         self.ensure_one()
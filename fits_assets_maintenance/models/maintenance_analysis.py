@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, tools
+
+
+class MaintenanceAnalysis(models.Model):
+    _name = 'fits.maintenance.analysis'
+    _description = 'Maintenance Analysis'
+    _auto = False
+    _order = 'scheduled_date desc'
+
+    maintenance_request_id = fields.Many2one('fits.maintenance.request', string='Maintenance Request', readonly=True)
+    asset_id = fields.Many2one('fits.asset', string='Asset', readonly=True)
+    category_id = fields.Many2one('fits.asset.category', string='Category', readonly=True)
+    location_asset_id = fields.Many2one('fits.location.assets', string='Location Assets', readonly=True)
+    team_id = fields.Many2one('fits.maintenance.team', string='Team', readonly=True)
+    user_id = fields.Many2one('res.users', string='Responsible', readonly=True)
+    maintenance_type = fields.Selection([
+        ('corrective', 'Corrective'),
+        ('preventive', 'Preventive')
+    ], string='Maintenance Type', readonly=True)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('in_progress', 'In Progress'),
+        ('repaired', 'Repaired'),
+        ('cancelled', 'Cancelled'),
+        ('done', 'Done')
+    ], string='Status', readonly=True)
+    scheduled_date = fields.Date(string='Scheduled Start', readonly=True)
+    scheduled_end_date = fields.Date(string='Scheduled End', readonly=True)
+
+    request_count = fields.Integer(string='# Requests', readonly=True, aggregator='sum')
+    corrective_count = fields.Integer(string='# Corrective', readonly=True, aggregator='sum')
+    preventive_count = fields.Integer(string='# Preventive', readonly=True, aggregator='sum')
+    corrective_rate = fields.Float(string='Corrective Rate (%)', readonly=True, aggregator='avg',
+                                   help='Share of corrective requests among all requests')
+    repair_days = fields.Float(string='MTTR (days)', readonly=True, aggregator='avg',
+                               help='Mean time to repair: days between start and end of finished requests')
+    days_between_failures = fields.Float(string='MTBF (days)', readonly=True, aggregator='avg',
+                                         help='Mean time between failures: days since the previous corrective request of the same asset')
+    backlog_age_days = fields.Float(string='Backlog Age (days)', readonly=True, aggregator='avg',
+                                    help='Days since the scheduled start of requests that are still open')
+
+    def init(self):
+        tools.drop_view_if_exists(self._cr, self._table)
+        self._cr.execute("""
+            CREATE OR REPLACE VIEW fits_maintenance_analysis AS (
+                SELECT
+                    r.id AS id,
+                    r.id AS maintenance_request_id,
+                    r.asset_id,
+                    r.category_id,
+                    r.location_asset_id,
+                    r.team_id,
+                    r.user_id,
+                    r.maintenance_type,
+                    r.state,
+                    r.scheduled_date,
+                    r.scheduled_end_date,
+                    1 AS request_count,
+                    CASE WHEN r.maintenance_type = 'corrective' THEN 1 ELSE 0 END AS corrective_count,
+                    CASE WHEN r.maintenance_type = 'preventive' THEN 1 ELSE 0 END AS preventive_count,
+                    CASE WHEN r.maintenance_type = 'corrective' THEN 100.0 ELSE 0.0 END AS corrective_rate,
+                    CASE WHEN r.state IN ('repaired', 'done') AND r.scheduled_end_date IS NOT NULL
+                         THEN (r.scheduled_end_date - r.scheduled_date)::float
+                    END AS repair_days,
+                    CASE WHEN r.maintenance_type = 'corrective' AND r.state != 'cancelled'
+                         THEN (r.scheduled_date - LAG(r.scheduled_date) OVER failures)::float
+                    END AS days_between_failures,
+                    CASE WHEN r.state IN ('draft', 'in_progress', 'repaired')
+                         THEN GREATEST(CURRENT_DATE - r.scheduled_date, 0)::float
+                    END AS backlog_age_days
+                FROM fits_maintenance_request r
+                WINDOW failures AS (
+                    PARTITION BY r.asset_id,
+                                 (r.maintenance_type = 'corrective' AND r.state != 'cancelled')
+                    ORDER BY r.scheduled_date, r.id
+                )
+            );
+        """)
@@ -1,7 +1,29 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+import logging
+from collections import defaultdict
+
+from odoo import models, fields, api, _
 from odoo.exceptions import UserError
-from datetime import timedelta
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Largest date window (in days) expanded when the calendar is read
+EXPAND_MAX_DAYS = 366
+
+
+def virtual_event_id(asset_id, maintenance_date):
+    """Id of a recurring occurrence that is computed on read and not stored"""
+    return f'virtual_{asset_id}_{fields.Date.to_string(maintenance_date)}'
+
+
+def parse_virtual_event_id(virtual_id):
+    """Return (asset_id, maintenance_date) of a virtual occurrence id"""
+    try:
+        _prefix, asset_id, maintenance_date = virtual_id.split('_', 2)
+        return int(asset_id), fields.Date.to_date(maintenance_date)
+    except ValueError:
+        raise UserError(_('Invalid calendar event reference %s.', virtual_id))
 
 
 class MaintenanceCalendar(models.Model):
@@ -11,10 +33,11 @@ class MaintenanceCalendar(models.Model):
 
     name = fields.Char(string='Event Name', compute='_compute_name', store=True)
     asset_id = fields.Many2one('fits.asset', string='Asset', required=True)
-    maintenance_date = fields.Date(string='Maintenance Date', required=True)
+    maintenance_date = fields.Date(string='Maintenance Date', required=True, index=True)
     description = fields.Text(string='Description', related='asset_id.notes', store=False)
     recurrence_pattern = fields.Selection(related='asset_id.recurrence_pattern', store=False)
     responsible_person_id = fields.Many2one(related='asset_id.responsible_person_id', store=False)
+    responsible_user_id = fields.Many2one(related='asset_id.responsible_user_id', store=True, index=True)
 
     # New fields for Maintenance Results and Team from Maintenance Requests
     hasil_status = fields.Selection([
@@ -52,10 +75,20 @@ class MaintenanceCalendar(models.Model):
     recurrence_interval = fields.Integer(string='Recurrence Interval', related='asset_id.recurrence_interval', store=False, readonly=True)
     recurrence_end_date = fields.Date(string='Recurrence End Date', related='asset_id.recurrence_end_date', store=False, readonly=True)
 
+    _sql_constraints = [
+        ('asset_date_uniq', 'unique(asset_id, maintenance_date)',
+         'Only one maintenance calendar event is allowed per asset and date.'),
+    ]
+
+    def write(self, vals):
+        self._check_not_virtual()
+        return super(MaintenanceCalendar, self).write(vals)
+
     def unlink(self):
         """Override unlink to remove schedule-based deletion constraints"""
         # Removed validation for past and current dates - events can now be deleted anytime
         # If all checks pass, proceed with deletion
+        self._check_not_virtual()
         return super(MaintenanceCalendar, self).unlink()
 
     @api.depends('asset_id', 'maintenance_date')
@@ -73,19 +106,18 @@ class MaintenanceCalendar(models.Model):
             self.create_calendar_events()
 
     @api.model
-    def create_calendar_events(self):
-        """Create calendar events from assets with recurrence settings and maintenance requests without duplicates"""
-        print("DEBUG: Starting calendar event creation")
-
-        # First, clean up any existing duplicates
-        duplicates_removed = self.cleanup_duplicate_events()
-        if duplicates_removed > 0:
-            print(f"DEBUG: Cleaned up {duplicates_removed} duplicate events")
-
-        events_to_create = []
+    def _is_recurring_asset(self, asset):
+        """Whether the calendar shows recurring events for this asset"""
+        return bool(asset.recurrence_pattern != 'none' and
+                    asset.recurrence_start_date and
+                    (asset.recurrence_interval > 0 or asset.recurrence_end_date) and
+                    asset.maintenance_required and
+                    asset.status == 'maintenance')
 
-        # 1. Create events from assets with recurrence settings
-        assets = self.env['fits.asset'].search([
+    @api.model
+    def _get_recurring_asset_domain(self):
+        """Domain of the assets whose recurrence is shown in the calendar"""
+        return [
             ('recurrence_pattern', '!=', 'none'),
             ('recurrence_start_date', '!=', False),
             '|',
@@ -93,185 +125,253 @@ class MaintenanceCalendar(models.Model):
             ('recurrence_end_date', '!=', False),
             ('maintenance_required', '=', True),
             ('status', '=', 'maintenance')
-        ])
+        ]
 
-        print(f"DEBUG: Found {len(assets)} assets with recurrence settings")
+    @api.model
+    def _get_recurring_event_dates(self, asset, date_from=None, date_to=None):
+        """Occurrence dates shown in the calendar for a recurring asset, optionally within [date_from, date_to]
 
-        for asset in assets:
-            # Generate maintenance dates based on recurrence pattern and settings
-            maintenance_dates = []
+        Same dates as the generated maintenance requests and the next maintenance date.
+        """
+        return asset._iter_maintenance_occurrences(date_from, date_to)
 
-            if asset.recurrence_pattern == 'daily':
-                # For Daily: generate dates based on interval or end date
-                if asset.recurrence_interval and asset.recurrence_interval > 0:
-                    # Use interval: generate dates from start_date for interval number of occurrences
-                    print(f"DEBUG: Creating DAILY events for {asset.name} with interval {asset.recurrence_interval} from {asset.recurrence_start_date}")
+    @api.model
+    def _get_domain_date_window(self, domain):
+        """Return the (date_from, date_to) bounds put on maintenance_date by a search domain"""
+        date_from = date_to = None
+        for leaf in domain or []:
+            if not isinstance(leaf, (list, tuple)) or len(leaf) != 3 or leaf[0] != 'maintenance_date' or not leaf[2]:
+                continue
+            value = fields.Date.to_date(leaf[2])
+            if leaf[1] in ('>=', '>'):
+                date_from = max(date_from, value) if date_from else value
+            elif leaf[1] in ('<=', '<'):
+                date_to = min(date_to, value) if date_to else value
+        return date_from, date_to
 
-                    current_date = asset.recurrence_start_date
-                    for i in range(asset.recurrence_interval):
-                        maintenance_dates.append(current_date)
-                        current_date = current_date + timedelta(days=1)
+    @api.model
+    def _get_virtual_events(self, date_from, date_to):
+        """Recurring occurrences of the window [date_from, date_to] that have no stored event
+
+        Returns {virtual id: new (unsaved) event}. Occurrences are computed from the
+        recurrence rules of the assets and nothing is written: an event is only stored
+        once it carries state (see update_calendar_for_requests).
+        """
+        if (date_to - date_from).days > EXPAND_MAX_DAYS:
+            return {}
+        self.flush_model(['asset_id', 'maintenance_date'])
+        self.env.cr.execute("""
+            SELECT asset_id, maintenance_date
+              FROM fits_maintenance_calendar
+             WHERE maintenance_date BETWEEN %s AND %s
+        """, [date_from, date_to])
+        stored_keys = set(self.env.cr.fetchall())
+
+        events = {}
+        for asset in self.env['fits.asset'].search(self._get_recurring_asset_domain()):
+            for maintenance_date in self._get_recurring_event_dates(asset, date_from, date_to):
+                if (asset.id, maintenance_date) not in stored_keys:
+                    events[virtual_event_id(asset.id, maintenance_date)] = self.new(
+                        self._prepare_event_vals(asset.id, maintenance_date))
+        return events
 
-                    print(f"DEBUG: Generated {len(maintenance_dates)} daily maintenance dates using interval for {asset.name}")
+    @api.model
+    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None, **read_kwargs):
+        """Add the virtual recurring occurrences of the displayed window when reading the calendar"""
+        result = super(MaintenanceCalendar, self).search_read(domain, fields, offset, limit, order, **read_kwargs)
+        if not self.env.context.get('expand_recurring_events') or offset or limit:
+            return result
+        date_from, date_to = self._get_domain_date_window(domain)
+        if not (date_from and date_to):
+            return result
+        virtual_events = self._get_virtual_events(date_from, date_to)
+        if not virtual_events:
+            return result
+        # Filter and read all occurrences of the window at once
+        virtual_ids = {event.id: virtual_id for virtual_id, event in virtual_events.items()}
+        events = self.browse().concat(*virtual_events.values()).filtered_domain(domain or [])
+        for event, values in zip(events, events.read(fields, **read_kwargs)):
+            values['id'] = virtual_ids[event.id]
+            result.append(values)
+        return result
+
+    def web_read(self, specification):
+        """Read virtual occurrences opened from the calendar in memory, without storing them"""
+        if not any(isinstance(id_, str) for id_ in self._ids):
+            return super(MaintenanceCalendar, self).web_read(specification)
+        stored = self.browse([id_ for id_ in self._ids if not isinstance(id_, str)])
+        values_by_id = {values['id']: values for values in
+                        super(MaintenanceCalendar, stored).web_read(specification)} if stored else {}
+        virtual_ids = [id_ for id_ in self._ids if isinstance(id_, str)]
+        events = self.browse().concat(*(
+            self.new(self._prepare_event_vals(*parse_virtual_event_id(id_))) for id_ in virtual_ids))
+        for id_, values in zip(virtual_ids, events.web_read(specification)):
+            values['id'] = id_
+            values_by_id[id_] = values
+        return [values_by_id[id_] for id_ in self._ids if id_ in values_by_id]
+
+    def _check_not_virtual(self):
+        if any(isinstance(id_, str) for id_ in self._ids):
+            raise UserError(_('Recurring occurrences follow the recurrence of their asset and cannot be '
+                              'modified here. Use "Create Maintenance Request" on the event to plan work '
+                              'on this date instead.'))
 
-                elif asset.recurrence_end_date:
-                    # Use end date: generate dates from start_date to end_date
-                    print(f"DEBUG: Creating DAILY events for {asset.name} from {asset.recurrence_start_date} to {asset.recurrence_end_date}")
+    @api.model
+    def _prepare_event_vals(self, asset_id, maintenance_date, request_row=None):
+        """Values of a calendar event, taking status and team info from a maintenance request row"""
+        vals = {
+            'asset_id': asset_id,
+            'maintenance_date': maintenance_date,
+            'hasil_status': 'draft',
+            'team_id': False,
+            'maintenance_responsible_id': False,
+            'maintenance_email': False,
+        }
+        if request_row:
+            vals.update({
+                'hasil_status': request_row['hasil_status'],
+                'team_id': request_row['team_id'] or False,
+                'maintenance_responsible_id': request_row['maintenance_responsible_id'] or False,
+                'maintenance_email': request_row['maintenance_email'] or False,
+            })
+        return vals
 
-                    current_date = asset.recurrence_start_date
-                    while current_date <= asset.recurrence_end_date:
-                        maintenance_dates.append(current_date)
-                        current_date = current_date + timedelta(days=1)
+    @api.model
+    def _read_request_rows(self, asset_ids=None):
+        """Maintenance requests (newest first) with the values copied on calendar events, in one query"""
+        if asset_ids is not None and not asset_ids:
+            return []
+        self.env['fits.maintenance.request'].flush_model(
+            ['asset_id', 'scheduled_date', 'state', 'team_id', 'user_id'])
+        self.env['res.users'].flush_model(['partner_id'])
+        self.env['res.partner'].flush_model(['email'])
+
+        query = """
+            SELECT r.asset_id, r.scheduled_date, r.state AS hasil_status, r.team_id,
+                   r.user_id AS maintenance_responsible_id, p.email AS maintenance_email
+              FROM fits_maintenance_request r
+         LEFT JOIN res_users u ON u.id = r.user_id
+         LEFT JOIN res_partner p ON p.id = u.partner_id
+        """
+        params = []
+        if asset_ids is not None:
+            query += " WHERE r.asset_id IN %s"
+            params.append(tuple(asset_ids))
+        query += " ORDER BY r.create_date DESC, r.id DESC"
+        self.env.cr.execute(query, params)
+        return self.env.cr.dictfetchall()
 
-                    print(f"DEBUG: Generated {len(maintenance_dates)} daily maintenance dates using end date for {asset.name}")
-                else:
-                    print(f"DEBUG: Asset {asset.name} has daily pattern but no interval or end date - skipping")
+    @api.model
+    def _upsert_events(self, vals_list, update_fields=()):
+        """Insert calendar events with INSERT ... ON CONFLICT (asset_id, maintenance_date)
+
+        Events that already exist for an asset and date are left untouched, or get
+        ``update_fields`` overwritten when given. Returns the inserted/updated events.
+        """
+        columns = ['asset_id', 'maintenance_date', 'hasil_status', 'team_id',
+                   'maintenance_responsible_id', 'maintenance_email']
+        # One row per key: ON CONFLICT cannot affect the same row twice in a command
+        rows_by_key = {}
+        for vals in vals_list:
+            rows_by_key[(vals['asset_id'], vals['maintenance_date'])] = vals
+        if not rows_by_key:
+            return self.browse()
+
+        if update_fields:
+            action = "UPDATE SET %s, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date" % ", ".join(
+                f"{field} = EXCLUDED.{field}" for field in update_fields)
+        else:
+            action = "NOTHING"
+        self.flush_model()
+        now = self.env.cr.now()
+        uid = self.env.uid
+        event_ids = []
+        for rows in split_every(1000, rows_by_key.values()):
+            values = [tuple(vals.get(column) or None for column in columns) + (uid, now, uid, now)
+                      for vals in rows]
+            self.env.cr.execute(f"""
+                INSERT INTO fits_maintenance_calendar
+                       ({', '.join(columns)}, create_uid, create_date, write_uid, write_date)
+                VALUES {', '.join(['%s'] * len(values))}
+                ON CONFLICT (asset_id, maintenance_date) DO {action}
+                RETURNING id
+            """, values)
+            event_ids.extend(row[0] for row in self.env.cr.fetchall())
+
+        events = self.browse(event_ids)
+        if update_fields:
+            events.invalidate_recordset(list(update_fields))
+        # Compute the stored event name of the new rows
+        events.modified(['asset_id', 'maintenance_date'])
+        return events
 
-            else:
-                # For Weekly, Monthly, Yearly: create events only for start and calculated end dates
-                if asset.recurrence_start_date:
-                    start_date = asset.recurrence_start_date
-                    interval = asset.recurrence_interval or 1
-
-                    # Hitung end date otomatis jika belum ada
-                    from dateutil.relativedelta import relativedelta
-                    if asset.recurrence_pattern == 'weekly':
-                        end_date = start_date + timedelta(weeks=interval)
-                    elif asset.recurrence_pattern == 'monthly':
-                        end_date = start_date + relativedelta(months=interval)
-                    elif asset.recurrence_pattern == 'yearly':
-                        end_date = start_date + relativedelta(years=interval)
-                    else:
-                        end_date = start_date + timedelta(days=interval)
-
-                    print(f"DEBUG: Creating {asset.recurrence_pattern.upper()} events for {asset.name} (Start: {start_date}, End: {end_date})")
-                    maintenance_dates = [start_date, end_date]
-
-            # Get the latest maintenance request for this asset to populate status and team info
-            latest_request = self.env['fits.maintenance.request'].search([
-                ('asset_id', '=', asset.id)
-            ], order='create_date DESC', limit=1)
-
-            # Set default values
-            hasil_status = latest_request.state if latest_request else 'draft'
-            team_id = latest_request.team_id.id if latest_request and latest_request.team_id else False
-            maintenance_responsible_id = latest_request.user_id.id if latest_request and latest_request.user_id else False
-            maintenance_email = latest_request.email if latest_request and latest_request.email else False
-
-            # Create events for each maintenance date
-            for maintenance_date in maintenance_dates:
-                # Check if event already exists for this asset and date
-                existing_event = self.search([
-                    ('asset_id', '=', asset.id),
-                    ('maintenance_date', '=', maintenance_date)
-                ], limit=1)
-
-                if not existing_event:
-                    print(f"DEBUG: Creating calendar event for {asset.name} on {maintenance_date}")
-
-                    events_to_create.append({
-                        'asset_id': asset.id,
-                        'maintenance_date': maintenance_date,
-                        'hasil_status': hasil_status,
-                        'team_id': team_id,
-                        'maintenance_responsible_id': maintenance_responsible_id,
-                        'maintenance_email': maintenance_email,
-                    })
-                else:
-                    print(f"DEBUG: Event already exists for {asset.name} on {maintenance_date}")
-
-        # 2. Create events from maintenance requests (only if no recurring event exists for same date)
-        maintenance_requests = self.env['fits.maintenance.request'].search([
-            ('scheduled_date', '!=', False)
-        ])
+    @api.model
+    def sync_asset_events(self, assets):
+        """Bring the stored calendar events of the given assets in line with their recurrence settings
+
+        Recurring occurrences are virtual (see _get_virtual_events), so no event is
+        created here. Stored events are kept when they are backed by a maintenance
+        request or are still occurrences of the recurrence (including the stateless
+        occurrences stored by earlier versions); the others are removed in one unlink.
+        Returns (events created, events removed).
+        """
+        if not assets:
+            return 0, 0
+
+        existing_events = self.search([('asset_id', 'in', assets.ids)])
+        request_keys = {
+            (row['asset_id'], row['scheduled_date'])
+            for row in self._read_request_rows(assets.ids)
+            if row['scheduled_date']
+        }
 
-        print(f"DEBUG: Found {len(maintenance_requests)} maintenance requests")
-
-        for request in maintenance_requests:
-            # Check if this is a recurring asset (has recurrence settings)
-            asset_has_recurring = self.env['fits.asset'].search([
-                ('id', '=', request.asset_id.id),
-                ('recurrence_pattern', '!=', 'none'),
-                ('recurrence_start_date', '!=', False),
-                '|',
-                ('recurrence_interval', '>', 0),
-                ('recurrence_end_date', '!=', False),
-                ('maintenance_required', '=', True),
-                ('status', '=', 'maintenance')
-            ], limit=1)
-
-            # Check if event already exists for this exact asset and date
-            existing_event = self.search([
-                ('asset_id', '=', request.asset_id.id),
-                ('maintenance_date', '=', request.scheduled_date)
-            ], limit=1)
-
-            # Only create event if:
-            # 1. No existing event for this asset and date, OR
-            # 2. Asset doesn't have recurring settings (so we need individual request events)
-            if not existing_event and (not asset_has_recurring):
-                print(f"DEBUG: Creating request event for {request.asset_id.name} on {request.scheduled_date}")
-
-                events_to_create.append({
-                    'asset_id': request.asset_id.id,
-                    'maintenance_date': request.scheduled_date,
-                    'hasil_status': request.state,
-                    'team_id': request.team_id.id if request.team_id else False,
-                    'maintenance_responsible_id': request.user_id.id if request.user_id else False,
-                    'maintenance_email': request.email,
-                })
-            elif existing_event:
-                print(f"DEBUG: Event already exists for request {request.id} - {request.asset_id.name} on {request.scheduled_date}")
-            elif asset_has_recurring:
-                print(f"DEBUG: Skipping request {request.id} - asset {request.asset_id.name} has recurring settings")
-
-        # 3. Create all events in bulk (only if we have new events to create)
-        if events_to_create:
-            created_events = self.create(events_to_create)
-            print(f"DEBUG: Successfully created {len(created_events)} new calendar events")
-            return len(created_events)
-        else:
-            print("DEBUG: No new events to create (all events already exist)")
-            return 0
+        def is_stale(event):
+            if (event.asset_id.id, event.maintenance_date) in request_keys:
+                return False
+            return not (self._is_recurring_asset(event.asset_id) and next(
+                self._get_recurring_event_dates(event.asset_id, event.maintenance_date, event.maintenance_date), None))
+
+        stale_events = existing_events.filtered(is_stale)
+        if stale_events:
+            stale_events.unlink()
+        return 0, len(stale_events)
 
     @api.model
-    def cleanup_duplicate_events(self):
-        """Clean up duplicate calendar events for the same asset and date"""
-        print("DEBUG: Starting duplicate calendar events cleanup")
-
-        # Find all events grouped by asset and date
-        all_events = self.search([])
-
-        # Group events by asset_id and maintenance_date
-        event_groups = {}
-        for event in all_events:
-            key = (event.asset_id.id, event.maintenance_date)
-            if key not in event_groups:
-                event_groups[key] = []
-            event_groups[key].append(event)
-
-        # Remove duplicates, keeping only the first event for each asset-date combination
-        removed_count = 0
-        for key, events in event_groups.items():
-            if len(events) > 1:
-                # Keep the first event, remove the rest
-                events_to_keep = events[0]
-                events_to_remove = events[1:]
-
-                print(f"DEBUG: Found {len(events)} duplicate events for asset {events[0].asset_id.name} on {events[0].maintenance_date}")
-
-                for event in events_to_remove:
-                    print(f"DEBUG: Removing duplicate event {event.id}")
-                    event.unlink()
-                    removed_count += 1
-
-        print(f"DEBUG: Cleanup complete - removed {removed_count} duplicate events")
-        return removed_count
+    def create_calendar_events(self):
+        """Create the calendar events of maintenance requests without duplicates
+
+        Recurring occurrences are computed on read (see _get_virtual_events); only the
+        events backed by a request are stored. Existing (asset, date) pairs and the
+        requests are each loaded with a single query, missing events are computed in
+        memory and created in one batch.
+        """
+        self.flush_model(['asset_id', 'maintenance_date'])
+        self.env.cr.execute("SELECT asset_id, maintenance_date FROM fits_maintenance_calendar")
+        existing_keys = set(self.env.cr.fetchall())
+
+        request_rows = self._read_request_rows()
+        events_to_create = []
+        for row in request_rows:
+            key = (row['asset_id'], row['scheduled_date'])
+            if not row['scheduled_date'] or key in existing_keys:
+                continue
+            existing_keys.add(key)
+            events_to_create.append(self._prepare_event_vals(row['asset_id'], row['scheduled_date'], row))
+
+        # Insert all events in bulk; events created concurrently are skipped by the unique constraint
+        created_events = self._upsert_events(events_to_create)
+        _logger.info("Calendar rebuild: %d requests, %d events created",
+                     len(request_rows), len(created_events))
+        return len(created_events)
 
     def action_create_maintenance_request(self):
         """Create a new maintenance request from calendar event"""
         self.ensure_one()
-        
+        event = self
+        if isinstance(self.id, str):
+            # Virtual recurring occurrence: values are computed from its asset, nothing is stored
+            event = self.new(self._prepare_event_vals(*parse_virtual_event_id(self.id)))
+
         return {
             'type': 'ir.actions.act_window',
             'name': 'Create Maintenance Request',
@@ -279,66 +379,62 @@ class MaintenanceCalendar(models.Model):
             'view_mode': 'form',
             'target': 'current',
             'context': {
-                'default_asset_id': self.asset_id.id,
-                'default_scheduled_date': self.maintenance_date,
-                'default_user_id': self.maintenance_responsible_id.id if self.maintenance_responsible_id else self.env.user.id,
-                'default_team_id': self.team_id.id if self.team_id else False,
-                'default_maintenance_request_title': f'Maintenance for {self.asset_id.name}',
-                'default_description': f'Scheduled maintenance on {self.maintenance_date}',
+                'default_asset_id': event.asset_id.id,
+                'default_scheduled_date': event.maintenance_date,
+                'default_user_id': event.maintenance_responsible_id.id if event.maintenance_responsible_id else self.env.user.id,
+                'default_team_id': event.team_id.id if event.team_id else False,
+                'default_maintenance_request_title': f'Maintenance for {event.asset_id.name}',
+                'default_description': f'Scheduled maintenance on {event.maintenance_date}',
             }
         }
 
     @api.model
     def update_calendar_for_request(self, request_id):
         """Update calendar events for a specific maintenance request without creating duplicates"""
-        request = self.env['fits.maintenance.request'].browse(request_id)
-        if not request:
+        return self.update_calendar_for_requests(self.env['fits.maintenance.request'].browse(request_id))
+
+    @api.model
+    def update_calendar_for_requests(self, requests):
+        """Update calendar events for a recordset of maintenance requests without creating duplicates
+
+        Matching events of all requests are fetched with one search, updated with one
+        write per group of identical values, and missing events are upserted in one
+        batch: a recurring occurrence is stored once a request gives it a state.
+        Returns the number of events updated or created.
+        """
+        requests = requests.filtered('asset_id')
+        if not requests:
             return 0
 
-        print(f"DEBUG: Updating calendar for maintenance request {request.id} - State: {request.state}")
-
-        # Find existing event for this maintenance request by asset and scheduled date
-        existing_event = self.search([
-            ('asset_id', '=', request.asset_id.id),
-            ('maintenance_date', '=', request.scheduled_date if request.scheduled_date else False)
-        ], limit=1)
-
-        if existing_event:
-            # Update existing event status and details
-            print(f"DEBUG: Updating existing event status to {request.state}")
-            existing_event.write({
-                'hasil_status': request.state,
-                'team_id': request.team_id.id if request.team_id else False,
-                'maintenance_responsible_id': request.user_id.id if request.user_id else False,
-                'maintenance_email': request.email,
-            })
-            return 1
-        else:
-            # Only create new event if this request doesn't have a corresponding recurring event
-            asset_has_recurring = self.env['fits.asset'].search([
-                ('id', '=', request.asset_id.id),
-                ('recurrence_pattern', '!=', 'none'),
-                ('recurrence_start_date', '!=', False),
-                '|',
-                ('recurrence_interval', '>', 0),
-                ('recurrence_end_date', '!=', False),
-                ('maintenance_required', '=', True),
-                ('status', '=', 'maintenance')
-            ], limit=1)
-
-            # If asset has recurring settings, don't create individual request events (they're handled by recurrence)
-            if asset_has_recurring:
-                print(f"DEBUG: Asset {request.asset_id.name} has recurring settings - not creating individual request event")
-                return 0
-
-            # Create new event only for non-recurring assets
-            print(f"DEBUG: Creating new event for maintenance request {request.id}")
-            self.create({
-                'asset_id': request.asset_id.id,
-                'maintenance_date': request.scheduled_date if request.scheduled_date else fields.Date.today(),
-                'hasil_status': request.state,
-                'team_id': request.team_id.id if request.team_id else False,
-                'maintenance_responsible_id': request.user_id.id if request.user_id else False,
-                'maintenance_email': request.email,
-            })
-            return 1
+        today = fields.Date.today()
+        update_fields = ['hasil_status', 'team_id', 'maintenance_responsible_id', 'maintenance_email']
+
+        # Values per (asset, date); the last request of the recordset wins for a shared date
+        vals_by_key = {}
+        for request in requests:
+            maintenance_date = request.scheduled_date or today
+            vals_by_key[(request.asset_id.id, maintenance_date)] = self._prepare_event_vals(
+                request.asset_id.id, maintenance_date, {
+                    'hasil_status': request.state,
+                    'team_id': request.team_id.id,
+                    'maintenance_responsible_id': request.user_id.id,
+                    'maintenance_email': request.email,
+                })
+
+        # Find existing events for these requests by asset and scheduled date
+        existing_events = self.search([
+            ('asset_id', 'in', list({asset_id for asset_id, _date in vals_by_key})),
+            ('maintenance_date', 'in', list({maintenance_date for _asset_id, maintenance_date in vals_by_key})),
+        ])
+        events_by_values = defaultdict(lambda: self.browse())
+        for event in existing_events:
+            vals = vals_by_key.pop((event.asset_id.id, event.maintenance_date), None)
+            if vals:
+                events_by_values[tuple(vals[field] for field in update_fields)] |= event
+        updated_count = 0
+        for values, events in events_by_values.items():
+            events.write(dict(zip(update_fields, values)))
+            updated_count += len(events)
+
+        created_events = self._upsert_events(list(vals_by_key.values()), update_fields=update_fields)
+        return updated_count + len(created_events)
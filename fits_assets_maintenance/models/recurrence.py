@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from dateutil.relativedelta import relativedelta
+
+# One step of each recurrence pattern
+RECURRENCE_STEPS = {
+    'daily': relativedelta(days=1),
+    'weekly': relativedelta(weeks=1),
+    'monthly': relativedelta(months=1),
+    'yearly': relativedelta(years=1),
+}
+
+
+def iter_occurrences(start, pattern, interval=1, count=None, until=None, date_from=None, date_to=None):
+    """Lazily yield recurrence dates ``start + k * interval * pattern`` (k = 0, 1, ...)
+
+    :param start: first occurrence (date)
+    :param pattern: 'daily', 'weekly', 'monthly' or 'yearly'; anything else yields nothing
+    :param interval: number of pattern steps between two occurrences
+    :param count: maximum number of occurrences, counted from ``start``
+    :param until: last possible occurrence date (inclusive)
+    :param date_from: only yield occurrences on or after this date
+    :param date_to: stop after this date (inclusive)
+
+    Every occurrence is computed from ``start`` (no drift on month ends: Jan 31 gives
+    Feb 28/29, then Mar 31) and the iterator jumps directly to ``date_from``, so asking
+    for the next date of a daily recurrence started years ago costs O(1).
+    """
+    if not start or pattern not in RECURRENCE_STEPS:
+        return
+    interval = max(interval or 1, 1)
+    unit = RECURRENCE_STEPS[pattern]
+
+    index = 0
+    if date_from and date_from > start:
+        if unit.days:
+            index = (date_from - start).days // (unit.days * interval)
+        else:
+            months = (unit.months + 12 * unit.years) * interval
+            elapsed = (date_from.year - start.year) * 12 + date_from.month - start.month
+            index = max(elapsed // months - 1, 0)
+
+    while count is None or index < count:
+        occurrence = start + unit * (index * interval)
+        if (until and occurrence > until) or (date_to and occurrence > date_to):
+            return
+        if not date_from or occurrence >= date_from:
+            yield occurrence
+        index += 1
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Benchmark fits.asset creation: one create() per row versus batched create() calls
+
+Run from an Odoo shell on a test database::
+
+    from odoo.addons.fits_assets_maintenance.scripts.benchmark_asset_create import benchmark_asset_create
+    benchmark_asset_create(env, rows=5000, batch_size=1000)
+
+Both call patterns run on the installed create() path, so the output compares two
+ways of calling it, not this module version against an older one. To get
+before/after numbers for a change of create() itself, run the script on a database
+with each module version installed and compare the rows per second of the same
+call pattern; the generated values are deterministic, so both runs create the
+same rows. Results are logged and returned as {pattern: rows per second}.
+
+Every run happens inside a savepoint that is rolled back, so no assets are kept.
+Unique counters reserved during the run are not given back (sequences are not
+transactional), which only leaves a gap in the numbering.
+"""
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+def _prepare_vals_list(env, rows):
+    """Build asset values spread over the existing main assets, categories and locations"""
+    categories = env['fits.asset.category'].search([])
+    locations = env['fits.location.assets'].search([])
+    if not categories or not locations:
+        raise ValueError('At least one Asset Category and one Location Assets record are required.')
+
+    vals_list = []
+    for index in range(rows):
+        category = categories[index % len(categories)]
+        vals_list.append({
+            'asset_name': f'Benchmark Asset {index:06d}',
+            'main_asset_selection': category.main_asset_id.id,
+            'category_id': category.id,
+            'location_asset_selection': locations[index % len(locations)].id,
+            'maintenance_required': False,
+        })
+    return vals_list
+
+
+def _timed_run(env, vals_list, batch_size):
+    """Create vals_list in batches of batch_size inside a rolled back savepoint"""
+    Asset = env['fits.asset']
+    start = time.perf_counter()
+    try:
+        with env.cr.savepoint(flush=False) as savepoint:
+            for offset in range(0, len(vals_list), batch_size):
+                Asset.create([dict(vals) for vals in vals_list[offset:offset + batch_size]])
+            env.flush_all()
+            elapsed = time.perf_counter() - start
+            savepoint.rollback()
+    finally:
+        env.invalidate_all()
+    return elapsed
+
+
+def benchmark_asset_create(env, rows=5000, batch_size=1000):
+    """Compare rows per second of two call patterns: one create() per row and batched create()"""
+    vals_list = _prepare_vals_list(env, rows)
+    results = {}
+    patterns = (
+        ('one_per_row', 1, 'one create() per row'),
+        ('batched', batch_size, f'one create() per {batch_size} rows'),
+    )
+    for key, size, label in patterns:
+        elapsed = _timed_run(env, vals_list, size)
+        results[key] = rows / elapsed if elapsed else 0.0
+        _logger.info("fits.asset create, %s: %d rows in %.2fs (%.0f rows/s)", label, rows, elapsed, results[key])
+
+    if results['one_per_row']:
+        _logger.info("fits.asset create, batched calls vs one call per row on the same create() path: x%.1f",
+                     results['batched'] / results['one_per_row'])
+    return results
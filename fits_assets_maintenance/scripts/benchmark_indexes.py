@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the fits index suite: EXPLAIN plans and timings without and with the indexes
+
+Run from an Odoo shell on a test database::
+
+    from odoo.addons.fits_assets_maintenance.scripts.benchmark_indexes import benchmark_indexes
+    benchmark_indexes(env, assets=2000, requests_per_asset=10, seed=42)
+
+Assets and maintenance requests are seeded first, then the searches issued by the
+report wizards, the calendar window and the calendar rebuild are explained and
+timed twice: with the index suite dropped ("before") and in place ("after").
+Everything happens inside a savepoint that is rolled back, indexes included.
+"""
+import logging
+import random
+import time
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tools.sql import SQL, make_index_name
+
+from .benchmark_asset_create import _prepare_vals_list
+
+_logger = logging.getLogger(__name__)
+
+# (table, column) pairs indexed with index=True or index='trigram'
+INDEXED_COLUMNS = [
+    ('fits_asset', 'status'),
+    ('fits_asset', 'serial_number_code'),
+    ('fits_asset', 'asset_name'),
+    ('fits_asset', 'unique_counter'),
+    ('fits_asset', 'acquisition_date'),
+    ('fits_asset', 'category_id'),
+    ('fits_maintenance_request', 'scheduled_date'),
+    ('fits_maintenance_calendar', 'maintenance_date'),
+    ('fits_asset_transfer', 'transfer_date'),
+    ('fits_asset_transfer', 'name'),
+    ('overtime_request', 'start_datetime'),
+]
+
+# Composite indexes created in init()
+COMPOSITE_INDEXES = [
+    'fits_maintenance_request_asset_state_date_index',
+    'overtime_request_employee_start_status_index',
+]
+
+
+def _seed(env, assets, requests_per_asset, seed):
+    """Create assets spread over ten years and maintenance requests spread over five years"""
+    rng = random.Random(seed)
+    today = fields.Date.context_today(env['fits.asset'])
+
+    vals_list = _prepare_vals_list(env, assets)
+    for vals in vals_list:
+        vals['acquisition_date'] = today - timedelta(days=rng.randrange(3650))
+    asset_records = env['fits.asset'].create(vals_list)
+
+    request_vals_list = []
+    for asset in asset_records:
+        for index in range(requests_per_asset):
+            request_vals_list.append({
+                'asset_id': asset.id,
+                'user_id': False,
+                'maintenance_request_title': f'Benchmark {index}',
+                'description': 'Benchmark request',
+                'maintenance_type': rng.choice(['corrective', 'preventive']),
+                'scheduled_date': today - timedelta(days=rng.randrange(1825)),
+            })
+    env['fits.maintenance.request'].create(request_vals_list)
+    env.flush_all()
+    for table in ('fits_asset', 'fits_maintenance_request', 'fits_maintenance_calendar'):
+        env.cr.execute(SQL("ANALYZE %s", SQL.identifier(table)))
+    return asset_records
+
+
+def _get_scenarios(env, asset_records):
+    """Searches issued by the report wizards and views: (label, model, domain, order)"""
+    today = fields.Date.context_today(env['fits.asset'])
+    year_start = today - timedelta(days=365)
+    categories = asset_records.mapped('category_id')[:3]
+    sample = asset_records[len(asset_records) // 2]
+
+    scenarios = [
+        ('asset report (category + dates)', 'fits.asset',
+         [('category_id', 'in', categories.ids), ('acquisition_date', '>=', year_start), ('acquisition_date', '<=', today)],
+         'acquisition_date asc, id asc'),
+        ('asset QR report (all mode)', 'fits.asset',
+         [('serial_number_code', '!=', False), ('acquisition_date', '>=', year_start), ('acquisition_date', '<=', today)],
+         None),
+        ('asset lookup by serial code', 'fits.asset',
+         [('serial_number_code', '=', sample.serial_number_code)], None),
+        ('asset autocomplete (serial fragment)', 'fits.asset',
+         [('serial_number_code', 'ilike', sample.serial_number_code[-4:])], None),
+        ('asset autocomplete (name fragment)', 'fits.asset',
+         [('asset_name', 'ilike', sample.asset_name[-6:])], None),
+        ('assets in maintenance', 'fits.asset', [('status', '=', 'maintenance')], None),
+        ('maintenance report (dates)', 'fits.maintenance.request',
+         [('scheduled_date', '>=', today - timedelta(days=30)), ('scheduled_date', '<=', today)],
+         'scheduled_date asc'),
+        ('asset draft requests', 'fits.maintenance.request',
+         [('asset_id', '=', sample.id), ('state', '=', 'draft')], 'scheduled_date asc'),
+        ('calendar month window', 'fits.maintenance.calendar',
+         [('maintenance_date', '>=', today.replace(day=1)), ('maintenance_date', '<=', today.replace(day=1) + timedelta(days=41))],
+         None),
+        ('asset transfer report (dates)', 'fits.asset.transfer',
+         [('transfer_date', '>=', year_start), ('transfer_date', '<=', today)], 'transfer_date asc, id asc'),
+    ]
+    if 'overtime.request' in env:
+        scenarios.append(('overtime report (employees + period)', 'overtime.request',
+                          [('employee_id', 'in', env['hr.employee'].search([], limit=5).ids),
+                           ('start_datetime', '>=', fields.Datetime.to_datetime(year_start)),
+                           ('status', 'in', ['approved', 'submitted', 'rejected'])],
+                          None))
+    return scenarios
+
+
+def _explain(env, model, domain, order):
+    """Return the EXPLAIN ANALYZE plan lines and the execution time (ms) of a search"""
+    query = env[model].sudo()._search(domain, order=order)
+    env.cr.execute(SQL("EXPLAIN (ANALYZE, BUFFERS) %s", query.select()))
+    plan = [row[0] for row in env.cr.fetchall()]
+    execution_ms = next((float(line.split(':')[1].split()[0]) for line in plan
+                         if line.startswith('Execution Time')), 0.0)
+    return plan, execution_ms
+
+
+def _measure(env, scenarios):
+    """Explain every scenario and time a full calendar rebuild"""
+    results = {}
+    for label, model, domain, order in scenarios:
+        results[label] = _explain(env, model, domain, order)
+    start = time.perf_counter()
+    with env.cr.savepoint(flush=False) as savepoint:
+        env['fits.maintenance.calendar'].sudo().create_calendar_events()
+        env.flush_all()
+        results['calendar rebuild'] = ([], (time.perf_counter() - start) * 1000)
+        savepoint.rollback()
+    env.invalidate_all()
+    return results
+
+
+def _drop_indexes(env):
+    """Drop the index suite (inside the caller's savepoint)"""
+    names = [make_index_name(table, column) for table, column in INDEXED_COLUMNS] + COMPOSITE_INDEXES
+    for name in names:
+        env.cr.execute(SQL("DROP INDEX IF EXISTS %s", SQL.identifier(name)))
+
+
+def benchmark_indexes(env, assets=2000, requests_per_asset=10, seed=42, show_plans=False):
+    """Print and return {scenario: {'before': ms, 'after': ms}} for the index suite"""
+    results = {}
+    try:
+        with env.cr.savepoint(flush=False) as savepoint:
+            asset_records = _seed(env, assets, requests_per_asset, seed)
+            scenarios = _get_scenarios(env, asset_records)
+
+            after = _measure(env, scenarios)
+            with env.cr.savepoint(flush=False) as no_index:
+                _drop_indexes(env)
+                before = _measure(env, scenarios)
+                no_index.rollback()
+            savepoint.rollback()
+    finally:
+        env.invalidate_all()
+
+    for label, (plan_after, after_ms) in after.items():
+        plan_before, before_ms = before[label]
+        results[label] = {'before': before_ms, 'after': after_ms}
+        _logger.info("fits index benchmark %s: %.2fms -> %.2fms", label, before_ms, after_ms)
+        print(f"{label:>40}: {before_ms:9.2f} ms -> {after_ms:9.2f} ms")
+        if show_plans and plan_after:
+            print('    before: ' + '\n            '.join(plan_before))
+            print('    after:  ' + '\n            '.join(plan_after))
+    return results
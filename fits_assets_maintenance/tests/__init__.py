@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from . import test_maintenance_request_write
+from . import test_asset_recurrence
+from . import test_maintenance_calendar
+from . import test_asset_scan
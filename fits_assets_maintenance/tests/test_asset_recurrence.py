@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAssetRecurrence(TransactionCase):
+    """Recurrence Interval is a number of occurrences for the next date, the schedule and the calendar"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        main_asset = cls.env['fits.main.assets'].create({'asset_name': 'Test Main Asset', 'asset_code': 'TM'})
+        cls.category = cls.env['fits.asset.category'].create({
+            'name': 'Test Category',
+            'category_code': 'TC',
+            'main_asset_id': main_asset.id,
+        })
+        cls.location = cls.env['fits.location.assets'].create({'location_name': 'Test Location', 'location_code': 'TL'})
+        cls.today = fields.Date.context_today(cls.env['fits.asset'])
+
+    def _create_asset(self, pattern, start, interval=False, end_date=False):
+        return self.env['fits.asset'].create({
+            'asset_name': f'Recurring {pattern}',
+            'main_asset_selection': self.category.main_asset_id.id,
+            'category_id': self.category.id,
+            'location_asset_selection': self.location.id,
+            'status': 'maintenance',
+            'maintenance_required': True,
+            'recurrence_pattern': pattern,
+            'recurrence_start_date': start,
+            'recurrence_interval': interval,
+            'recurrence_end_date': end_date,
+        })
+
+    def test_interval_is_occurrence_count(self):
+        asset = self._create_asset('weekly', self.today, interval=4)
+        expected = [self.today + timedelta(weeks=week) for week in range(4)]
+        self.assertEqual(list(asset._iter_maintenance_occurrences()), expected)
+        # Next date is the second occurrence, not start + 4 weeks
+        self.assertEqual(asset.next_maintenance_date, expected[1])
+        self.assertEqual(list(self.env['fits.maintenance.calendar']._get_recurring_event_dates(asset)), expected)
+
+    def test_next_date_after_last_occurrence(self):
+        # Two daily occurrences in the past: nothing left to schedule
+        asset = self._create_asset('daily', self.today - timedelta(days=10), interval=2)
+        self.assertFalse(asset.next_maintenance_date)
+
+    def test_end_date(self):
+        asset = self._create_asset('daily', self.today, end_date=self.today + timedelta(days=3))
+        self.assertEqual(asset.next_maintenance_date, self.today + timedelta(days=1))
+        self.assertEqual(len(list(asset._iter_maintenance_occurrences())), 4)
+
+    def test_next_date_matches_generated_schedule(self):
+        asset = self._create_asset('weekly', self.today, interval=3)
+        asset.generate_maintenance_schedule()
+        requests = self.env['fits.maintenance.request'].search([('asset_id', '=', asset.id)])
+        self.assertEqual(sorted(requests.mapped('scheduled_date')),
+                         [self.today + timedelta(weeks=week) for week in range(3)])
+        self.assertIn(asset.next_maintenance_date, requests.mapped('scheduled_date'))
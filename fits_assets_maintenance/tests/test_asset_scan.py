@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import TransactionCase, tagged
+
+from ..models import asset as asset_module
+
+
+@tagged('post_install', '-at_install')
+class TestAssetScanCache(TransactionCase):
+    """Scan summaries are evicted on write whether or not they are cached"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        main_asset = cls.env['fits.main.assets'].create({'asset_name': 'Test Main Asset', 'asset_code': 'TM'})
+        category = cls.env['fits.asset.category'].create({
+            'name': 'Test Category',
+            'category_code': 'TC',
+            'main_asset_id': main_asset.id,
+        })
+        location = cls.env['fits.location.assets'].create({'location_name': 'Test Location', 'location_code': 'TL'})
+        cls.asset = cls.env['fits.asset'].create({
+            'asset_name': 'Scanned Asset',
+            'main_asset_selection': main_asset.id,
+            'category_id': category.id,
+            'location_asset_selection': location.id,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.code = self.asset.serial_number_code
+        self.key = (self.env.cr.dbname, self.code)
+        asset_module._evict_scan_entry(self.key)
+
+    def test_write_with_cold_cache(self):
+        self.assertNotIn(self.key, asset_module._scan_cache)
+        self.asset.write({'asset_name': 'Renamed Cold'})
+        self.assertNotIn(self.key, asset_module._scan_cache)
+        self.assertEqual(self.env['fits.asset']._get_scan_summary(self.code)['asset_name'], 'Renamed Cold')
+
+    def test_write_with_warm_cache(self):
+        self.assertEqual(self.env['fits.asset']._get_scan_summary(self.code)['asset_name'], 'Scanned Asset')
+        self.assertIn(self.key, asset_module._scan_cache)
+        self.asset.write({'asset_name': 'Renamed Warm'})
+        self.assertNotIn(self.key, asset_module._scan_cache)
+        self.assertEqual(self.env['fits.asset']._get_scan_summary(self.code)['asset_name'], 'Renamed Warm')
+
+    def test_unlink_evicts_summary(self):
+        self.env['fits.asset']._get_scan_summary(self.code)
+        self.asset.unlink()
+        self.assertNotIn(self.key, asset_module._scan_cache)
+        self.assertIsNone(self.env['fits.asset']._get_scan_summary(self.code))
+
+    def test_cached_asset_deleted_elsewhere(self):
+        # Deleted by another worker: this worker's cache still holds the summary
+        self.env['fits.asset']._get_scan_summary(self.code)
+        self.env.flush_all()
+        self.env.cr.execute("DELETE FROM fits_asset WHERE id = %s", [self.asset.id])
+        self.env.invalidate_all()
+        self.assertIsNone(self.env['fits.asset']._get_scan_summary(self.code))
+        self.assertNotIn(self.key, asset_module._scan_cache)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from lxml import etree
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+from ..models.maintenance_calendar import virtual_event_id
+
+
+@tagged('post_install', '-at_install')
+class TestMaintenanceCalendar(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        main_asset = cls.env['fits.main.assets'].create({'asset_name': 'Test Main Asset', 'asset_code': 'TM'})
+        cls.category = cls.env['fits.asset.category'].create({
+            'name': 'Test Category',
+            'category_code': 'TC',
+            'main_asset_id': main_asset.id,
+        })
+        cls.location = cls.env['fits.location.assets'].create({'location_name': 'Test Location', 'location_code': 'TL'})
+        cls.team = cls.env['fits.maintenance.team'].create({'name': 'Test Team'})
+        cls.today = fields.Date.context_today(cls.env['fits.asset'])
+        cls.assets = cls.env['fits.asset'].create([{
+            'asset_name': f'Test Asset {index}',
+            'main_asset_selection': main_asset.id,
+            'category_id': cls.category.id,
+            'location_asset_selection': cls.location.id,
+        } for index in range(10)])
+        cls.Calendar = cls.env['fits.maintenance.calendar']
+        # Events of requests that existed before the test
+        cls.Calendar.create_calendar_events()
+
+    def _create_requests(self, assets, dates):
+        return self.env['fits.maintenance.request'].create([{
+            'asset_id': asset.id,
+            'user_id': False,
+            'team_id': self.team.id,
+            'maintenance_request_title': f'Test {asset.asset_name}',
+            'description': 'Test request',
+            'scheduled_date': scheduled_date,
+        } for asset in assets for scheduled_date in dates])
+
+    def _count_rebuild_queries(self):
+        """Remove the events of the test assets and count the queries of a full rebuild"""
+        self.Calendar.search([('asset_id', 'in', self.assets.ids)]).unlink()
+        self.env.flush_all()
+        self.env.invalidate_all()
+        count = self.cr.sql_log_count
+        created = self.Calendar.create_calendar_events()
+        self.env.flush_all()
+        return created, self.cr.sql_log_count - count
+
+    def test_create_calendar_events_query_count(self):
+        # N requests
+        self._create_requests(self.assets, [self.today])
+        created, expected = self._count_rebuild_queries()
+        self.assertEqual(created, 10)
+
+        # 10 x N requests: same number of queries
+        self._create_requests(self.assets, [self.today + timedelta(days=day) for day in range(1, 10)])
+        self.Calendar.search([('asset_id', 'in', self.assets.ids)]).unlink()
+        self.env.flush_all()
+        self.env.invalidate_all()
+        with self.assertQueryCount(expected):
+            created = self.Calendar.create_calendar_events()
+            self.env.flush_all()
+        self.assertEqual(created, 100)
+        self.assertEqual(self.Calendar.search_count([('asset_id', 'in', self.assets.ids)]), 100)
+        # Idempotent: nothing left to create
+        self.assertEqual(self.Calendar.create_calendar_events(), 0)
+
+    def _create_recurring_asset(self):
+        # Weekly, 3 occurrences: today, +1 week, +2 weeks
+        return self.env['fits.asset'].create({
+            'asset_name': 'Recurring Asset',
+            'main_asset_selection': self.category.main_asset_id.id,
+            'category_id': self.category.id,
+            'location_asset_selection': self.location.id,
+            'status': 'maintenance',
+            'maintenance_required': True,
+            'recurrence_pattern': 'weekly',
+            'recurrence_start_date': self.today,
+            'recurrence_interval': 3,
+        })
+
+    def test_search_read_expands_virtual_occurrences(self):
+        asset = self._create_recurring_asset()
+        stored_count = self.Calendar.search_count([])
+        domain = [('maintenance_date', '>=', self.today), ('maintenance_date', '<=', self.today + timedelta(days=30))]
+        calendar = self.Calendar.with_context(expand_recurring_events=True)
+
+        rows = calendar.search_read(domain + [('asset_id', '=', asset.id)], ['asset_id', 'maintenance_date', 'hasil_status'])
+        self.assertEqual(sorted(row['maintenance_date'] for row in rows),
+                         [self.today + timedelta(weeks=week) for week in range(3)])
+        for row in rows:
+            self.assertEqual(row['id'], virtual_event_id(asset.id, row['maintenance_date']))
+            self.assertEqual(row['asset_id'][0], asset.id)
+            self.assertEqual(row['hasil_status'], 'draft')
+        # Nothing is stored by reading
+        self.assertEqual(self.Calendar.search_count([]), stored_count)
+
+        # The domain applies to occurrences, and they are only added for the calendar
+        self.assertFalse(calendar.search_read(domain + [('asset_id', '=', self.assets[0].id)], ['asset_id']))
+        self.assertFalse(self.Calendar.search_read(domain + [('asset_id', '=', asset.id)], ['asset_id']))
+
+        # A stored event replaces the occurrence of its date
+        stored = self.Calendar.create({'asset_id': asset.id, 'maintenance_date': self.today})
+        rows = calendar.search_read(domain + [('asset_id', '=', asset.id)], ['maintenance_date'])
+        self.assertEqual(len(rows), 3)
+        self.assertIn(stored.id, [row['id'] for row in rows])
+
+    def test_web_read_virtual_occurrence(self):
+        asset = self._create_recurring_asset()
+        stored = self.Calendar.create({'asset_id': asset.id, 'maintenance_date': self.today})
+        virtual_id = virtual_event_id(asset.id, self.today + timedelta(weeks=1))
+        values = self.Calendar.browse([virtual_id, stored.id]).web_read({
+            'asset_id': {'fields': {'display_name': {}}},
+            'maintenance_date': {},
+            'hasil_status': {},
+        })
+        self.assertEqual([value['id'] for value in values], [virtual_id, stored.id])
+        self.assertEqual(values[0]['asset_id']['id'], asset.id)
+        self.assertEqual(values[0]['maintenance_date'], self.today + timedelta(weeks=1))
+
+        event = self.Calendar.browse(virtual_id)
+        with self.assertRaises(UserError):
+            event.write({'maintenance_date': self.today})
+        with self.assertRaises(UserError):
+            event.unlink()
+
+        action = event.action_create_maintenance_request()
+        self.assertEqual(action['context']['default_asset_id'], asset.id)
+        self.assertEqual(action['context']['default_scheduled_date'], self.today + timedelta(weeks=1))
+
+    def test_calendar_opens_virtual_occurrences_in_popup(self):
+        view = self.env.ref('fits_assets_maintenance.view_maintenance_calendar_calendar')
+        popup = self.env.ref('fits_assets_maintenance.view_maintenance_calendar_form_popup')
+        arch = self.Calendar.get_views([(view.id, 'calendar')])['views']['calendar']['arch']
+        calendar = etree.fromstring(arch)
+        self.assertEqual(calendar.get('event_open_popup'), '1')
+        self.assertEqual(calendar.get('form_view_id'), str(popup.id))
+        popup_arch = etree.fromstring(self.Calendar.get_views([(popup.id, 'form')])['views']['form']['arch'])
+        self.assertTrue(popup_arch.xpath("//button[@name='action_create_maintenance_request']"))
+        action = self.env.ref('fits_assets_maintenance.action_maintenance_calendar')
+        self.assertIn('expand_recurring_events', action.context)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestMaintenanceRequestWrite(TransactionCase):
+    """The single-pass write engine issues the same number of queries for 1 and N requests"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        main_asset = cls.env['fits.main.assets'].create({'asset_name': 'Test Main Asset', 'asset_code': 'TM'})
+        category = cls.env['fits.asset.category'].create({
+            'name': 'Test Category',
+            'category_code': 'TC',
+            'main_asset_id': main_asset.id,
+        })
+        location = cls.env['fits.location.assets'].create({'location_name': 'Test Location', 'location_code': 'TL'})
+        cls.team = cls.env['fits.maintenance.team'].create({'name': 'Test Team'})
+        cls.assets = cls.env['fits.asset'].create([{
+            'asset_name': f'Test Asset {index}',
+            'main_asset_selection': main_asset.id,
+            'category_id': category.id,
+            'location_asset_selection': location.id,
+        } for index in range(10)])
+
+    def _create_requests(self, assets):
+        return self.env['fits.maintenance.request'].create([{
+            'asset_id': asset.id,
+            'user_id': False,
+            'team_id': self.team.id,
+            'maintenance_request_title': f'Test {asset.asset_name}',
+            'description': 'Test request',
+            'scheduled_date': fields.Date.today(),
+        } for asset in assets])
+
+    def _count_write_queries(self, requests, vals):
+        """Number of queries issued by requests.write(vals), starting from an empty cache"""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        count = self.cr.sql_log_count
+        requests.write(vals)
+        self.env.flush_all()
+        return self.cr.sql_log_count - count
+
+    def _assert_constant_write(self, single, many, vals):
+        expected = self._count_write_queries(single, vals)
+        self.env.flush_all()
+        self.env.invalidate_all()
+        with self.assertQueryCount(expected):
+            many.write(vals)
+        self.assertEqual(set((single | many).mapped('state')), {vals['state']})
+
+    def test_start_progress_query_count(self):
+        single = self._create_requests(self.assets[:1])
+        many = self._create_requests(self.assets[1:])
+        self._assert_constant_write(single, many, {'state': 'in_progress'})
+        self.assertEqual(set(self.assets.mapped('status')), {'maintenance'})
+
+    def test_mark_done_query_count(self):
+        single = self._create_requests(self.assets[:1])
+        many = self._create_requests(self.assets[1:])
+        (single | many).write({'state': 'in_progress'})
+        (single | many).write({'state': 'repaired'})
+        self._assert_constant_write(single, many, {'state': 'done', 'scheduled_end_date': fields.Date.today()})
+        self.assertEqual(set(self.assets.mapped('status')), {'active'})
@@ -1 +1,2 @@
 from . import maintenance_request_cancel
+from . import asset_import
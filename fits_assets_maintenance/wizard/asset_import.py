@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import logging
+import time
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+
+class AssetImportWizard(models.TransientModel):
+    _name = 'fits.asset.import.wizard'
+    _description = 'Asset Import Wizard'
+
+    # Stored as an attachment so the import can read it from the filestore as a file
+    import_file = fields.Binary(string='File', required=True, attachment=True,
+                                help='CSV or XLSX file with one asset per row')
+    file_name = fields.Char(string='File Name')
+    chunk_size = fields.Integer(string='Chunk Size', default=1000,
+                                help='Number of rows resolved and created per batch')
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('done', 'Done')
+    ], string='Status', default='draft')
+    created_count = fields.Integer(string='Created Assets', readonly=True)
+    error_count = fields.Integer(string='Rows with Errors', readonly=True)
+    error_log = fields.Text(string='Errors', readonly=True)
+
+    def _open_import_file(self):
+        """Return a binary file object on the uploaded file, opened from the filestore when possible"""
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'import_file'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        # Attachments stored in the database are only available as a whole
+        return io.BytesIO(attachment.raw or b'')
+
+    def _iter_rows(self):
+        """Yield (row_number, row_dict) one row at a time from the uploaded CSV or XLSX file"""
+        file_name = (self.file_name or '').lower()
+
+        with self._open_import_file() as content:
+            if file_name.endswith('.xlsx'):
+                if not openpyxl:
+                    raise UserError(_('The Python library openpyxl is required to import XLSX files.'))
+                workbook = openpyxl.load_workbook(content, read_only=True, data_only=True)
+                try:
+                    rows = workbook.active.iter_rows(values_only=True)
+                    header = [str(cell or '').strip() for cell in next(rows, [])]
+                    for row_number, row in enumerate(rows, start=2):
+                        yield row_number, dict(zip(header, row))
+                finally:
+                    workbook.close()
+            else:
+                reader = csv.reader(io.TextIOWrapper(content, encoding='utf-8-sig', newline=''))
+                header = [column.strip() for column in next(reader, [])]
+                for row_number, row in enumerate(reader, start=2):
+                    yield row_number, dict(zip(header, row))
+
+    def _iter_chunks(self):
+        """Group the streamed rows into lists of at most chunk_size rows"""
+        chunk_size = max(self.chunk_size, 1)
+        chunk = []
+        for row in self._iter_rows():
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @api.model
+    def _load_reference_indexes(self):
+        """Preload code -> id indexes for Main Assets, Categories and Locations"""
+        main_assets = {
+            rec['asset_code']: rec['id']
+            for rec in self.env['fits.main.assets'].search_read([('asset_code', '!=', False)], ['asset_code'])
+        }
+        categories = {}
+        categories_by_main_asset = {}
+        for rec in self.env['fits.asset.category'].search_read([], ['category_code', 'main_asset_id']):
+            categories.setdefault(rec['category_code'], rec['id'])
+            main_asset_id = rec['main_asset_id'] and rec['main_asset_id'][0]
+            categories_by_main_asset[(main_asset_id, rec['category_code'])] = rec['id']
+        locations = {
+            rec['location_code']: rec['id']
+            for rec in self.env['fits.location.assets'].search_read([], ['location_code'])
+        }
+        return {
+            'main_assets': main_assets,
+            'categories': categories,
+            'categories_by_main_asset': categories_by_main_asset,
+            'locations': locations,
+        }
+
+    @api.model
+    def _prepare_asset_vals(self, row, indexes):
+        """Convert one file row into fits.asset values, raising ValueError on bad data"""
+        def cell(column):
+            value = row.get(column)
+            return str(value).strip() if value not in (None, '') else ''
+
+        asset_name = cell('asset_name')
+        if not asset_name:
+            raise ValueError(_('Asset name is missing.'))
+
+        vals = {'asset_name': asset_name}
+
+        main_asset_code = cell('main_asset_code')
+        main_asset_id = False
+        if main_asset_code:
+            main_asset_id = indexes['main_assets'].get(main_asset_code)
+            if not main_asset_id:
+                raise ValueError(_('Unknown Main Asset code "%s".') % main_asset_code)
+            vals['main_asset_selection'] = main_asset_id
+
+        category_code = cell('category_code')
+        category_id = (indexes['categories_by_main_asset'].get((main_asset_id, category_code))
+                       if main_asset_id else indexes['categories'].get(category_code))
+        if not category_id:
+            raise ValueError(_('Unknown Asset Category code "%s".') % category_code)
+        vals['category_id'] = category_id
+
+        location_code = cell('location_code')
+        location_id = indexes['locations'].get(location_code)
+        if not location_id:
+            raise ValueError(_('Unknown Location Assets code "%s".') % location_code)
+        vals['location_asset_selection'] = location_id
+
+        if cell('acquisition_date'):
+            acquisition_date = row['acquisition_date']
+            vals['acquisition_date'] = fields.Date.to_date(
+                acquisition_date if not isinstance(acquisition_date, str) else acquisition_date.strip()
+            )
+        if cell('acquisition_cost'):
+            vals['acquisition_cost'] = float(cell('acquisition_cost'))
+        if cell('condition'):
+            conditions = dict(self.env['fits.asset']._fields['condition'].selection)
+            if cell('condition') not in conditions:
+                raise ValueError(_('Invalid condition "%s".') % cell('condition'))
+            vals['condition'] = cell('condition')
+        if cell('notes'):
+            vals['notes'] = cell('notes')
+        return vals
+
+    def _create_chunk(self, rows_vals, errors):
+        """Create one chunk in a single batch, isolating failing rows if the batch fails"""
+        Asset = self.env['fits.asset']
+        try:
+            with self.env.cr.savepoint():
+                return len(Asset.create([vals for _row_number, vals in rows_vals]))
+        except Exception:
+            self.env.invalidate_all(flush=False)
+            created = 0
+            for row_number, vals in rows_vals:
+                try:
+                    with self.env.cr.savepoint():
+                        Asset.create([vals])
+                    created += 1
+                except Exception as e:
+                    self.env.invalidate_all(flush=False)
+                    errors.append((row_number, str(e)))
+            return created
+
+    def action_import(self):
+        """Stream the file in chunks, resolve references by code and create assets in batches"""
+        self.ensure_one()
+        if not self.import_file:
+            raise UserError(_('Please upload a file to import.'))
+
+        start = time.perf_counter()
+        indexes = self._load_reference_indexes()
+        created_count = 0
+        errors = []
+
+        for chunk in self._iter_chunks():
+            rows_vals = []
+            for row_number, row in chunk:
+                try:
+                    rows_vals.append((row_number, self._prepare_asset_vals(row, indexes)))
+                except (ValueError, TypeError) as e:
+                    errors.append((row_number, str(e)))
+            if rows_vals:
+                created_count += self._create_chunk(rows_vals, errors)
+
+            # Keep memory bounded: drop the records of this chunk from the cache
+            self.env.flush_all()
+            self.env.invalidate_all()
+
+        elapsed = time.perf_counter() - start
+        _logger.info("fits.asset import: %d assets created, %d rows rejected in %.2fs",
+                     created_count, len(errors), elapsed)
+
+        self.write({
+            'state': 'done',
+            'import_file': False,
+            'created_count': created_count,
+            'error_count': len(errors),
+            'error_log': '\n'.join(_('Row %(row)s: %(error)s', row=row_number, error=error)
+                                   for row_number, error in errors),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 from datetime import datetime, timedelta
 from odoo.exceptions import UserError
@@ -17,7 +17,7 @@ class OvertimeRequest(models.Model):
     employee_id = fields.Many2one('hr.employee', string="Employee", required=True)
     department_id = fields.Many2one('hr.department', string='Department', related='employee_id.department_id', store=True, readonly=True)
     manager_id = fields.Many2one('hr.employee', string='Manager', related='employee_id.parent_id', store=True, readonly=True)
-    start_datetime = fields.Datetime(string='Start Date Time', required=True)
+    start_datetime = fields.Datetime(string='Start Date Time', required=True, index=True)
     end_datetime = fields.Datetime(string='End Date Time', required=True)
     description = fields.Text(string='Description', help='Reason for overtime request')
     include_in_payroll = fields.Boolean(string='Include In Payroll', default=True)
@@ -57,6 +57,12 @@ class OvertimeRequest(models.Model):
         ('off', 'Days Off'),
     ], string='Request Day Type', compute='_compute_request_day_type', store=True, readonly=True)
 
+    def init(self):
+        super().init()
+        # Report wizard and reporting view: employees over a period, filtered by status
+        tools.create_index(self.env.cr, 'overtime_request_employee_start_status_index',
+                           self._table, ['employee_id', 'start_datetime', 'status'])
+
     @api.model
     def default_get(self, fields_list):
         res = super().default_get(fields_list)